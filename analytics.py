@@ -0,0 +1,340 @@
+import io
+import math
+import sys
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# Constants
+# -----------------------------------------------------------------------------
+CHUNK_SIZE = 4096             # Steps buffered before a vectorized update
+CONTACT_TOLERANCE = 1.0       # Gap (pixels) below which the ball touches a wall
+INTERVAL_BINS = 60            # Histogram bins for bounce intervals
+INTERVAL_RANGE = (0, 600)     # Bounce interval histogram range (steps)
+GAP_BINS = 50                 # Histogram bins for the ball-to-wall gap
+
+# Trajectory columns: ball x, y, vx, vy and hexagon rotation (radians)
+X, Y, VX, VY, ANGLE = range(5)
+
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream in O(1) memory.
+
+    Single values use Welford's update; whole chunks are reduced with NumPy
+    and merged with Chan et al.'s parallel formula, which gives the same
+    result without a Python loop per value.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def update_chunk(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+        mean = values.mean()
+        self._merge(values.size, mean, np.square(values - mean).sum(), values.min(), values.max())
+
+    def merge(self, other):
+        """Fold another RunningStats into this one"""
+        if other.count:
+            self._merge(other.count, other.mean, other._m2, other.min, other.max)
+
+    def _merge(self, count, mean, m2, minimum, maximum):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, float(minimum))
+        self.max = max(self.max, float(maximum))
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def as_dict(self):
+        if not self.count:
+            return {"count": 0}
+        return {"count": self.count, "mean": float(self.mean), "std": self.std,
+                "min": self.min, "max": self.max}
+
+
+class StreamingHistogram:
+    """Fixed-bin histogram with underflow and overflow counts"""
+
+    def __init__(self, bins, value_range):
+        self.edges = np.linspace(value_range[0], value_range[1], bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update_chunk(self, values):
+        values = np.asarray(values, dtype=float)
+        low, high = self.edges[0], self.edges[-1]
+        self.underflow += int(np.count_nonzero(values < low))
+        self.overflow += int(np.count_nonzero(values >= high))
+        counts, _ = np.histogram(values, bins=self.edges)
+        # np.histogram closes the last bin; keep the top edge exclusive
+        counts[-1] -= np.count_nonzero(values == high)
+        self.counts += counts
+
+    def as_dict(self):
+        return {"edges": self.edges.tolist(), "counts": self.counts.tolist(),
+                "underflow": self.underflow, "overflow": self.overflow}
+
+
+class TrajectoryAnalyzer:
+    """
+    Streaming physics-quality metrics for a ball inside a rotating hexagon.
+
+    Feed it states one step at a time with update() (they are buffered and
+    processed in chunks) or as arrays of shape (N, 5) with update_chunk().
+    Only running statistics and the last state of the previous chunk are
+    kept, so memory use does not grow with the length of the run.
+
+    Energies and angular momenta are per unit mass, in pixels and steps.
+    Screen y grows downward, so potential energy is -gravity * y.
+    """
+
+    def __init__(self, center, hexagon_radius, ball_radius, gravity, dt=1.0,
+                 contact_tolerance=CONTACT_TOLERANCE, chunk_size=CHUNK_SIZE):
+        self.cx, self.cy = float(center[0]), float(center[1])
+        self.ball_radius = ball_radius
+        self.gravity = gravity
+        self.dt = dt
+        self.contact_tolerance = contact_tolerance
+        self.apothem = hexagon_radius * math.cos(math.pi / 6)
+
+        # Outward edge normals in the hexagon's own frame (vertices sit at
+        # multiples of 60 degrees, so edge midpoints sit 30 degrees past them)
+        normal_angles = np.arange(6) * (math.pi / 3) + math.pi / 6
+        self._normals = np.vstack((np.cos(normal_angles), np.sin(normal_angles)))
+
+        self.energy = RunningStats()
+        self.energy_change = RunningStats()
+        self.speed = RunningStats()
+        self.angular_momentum = RunningStats()
+        self.relative_angular_momentum = RunningStats()
+        self.wall_gap = RunningStats()
+        self.bounce_interval = RunningStats()
+        self.bounce_interval_histogram = StreamingHistogram(INTERVAL_BINS, INTERVAL_RANGE)
+        self.wall_gap_histogram = StreamingHistogram(GAP_BINS, (0.0, self.apothem))
+
+        self.steps = 0
+        self.contact_steps = 0
+        self.bounces = 0
+        self.escapes = 0
+
+        # Carried across chunk boundaries
+        self._last_energy = None
+        self._last_angle = None
+        self._last_contact = False
+        self._last_bounce_step = None
+
+        self._buffer = np.empty((chunk_size, 5))
+        self._buffered = 0
+
+    def update(self, x, y, vx, vy, angle):
+        """Record one step; processed once a chunk has been buffered"""
+        self._buffer[self._buffered] = (x, y, vx, vy, angle)
+        self._buffered += 1
+        if self._buffered == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        """Process any buffered steps"""
+        if self._buffered:
+            count, self._buffered = self._buffered, 0
+            self.update_chunk(self._buffer[:count])
+
+    def update_chunk(self, states):
+        """Process an (N, 5) array of consecutive states"""
+        states = np.asarray(states, dtype=float)
+        n = len(states)
+        if n == 0:
+            return
+        x, y, vx, vy, angle = states.T
+        rx = x - self.cx
+        ry = y - self.cy
+
+        # Energy and its per-step change
+        speed_sq = vx * vx + vy * vy
+        energy = 0.5 * speed_sq - self.gravity * y
+        self.energy.update_chunk(energy)
+        self.speed.update_chunk(np.sqrt(speed_sq))
+        if self._last_energy is not None:
+            self.energy_change.update_chunk(np.diff(energy, prepend=self._last_energy))
+        else:
+            self.energy_change.update_chunk(np.diff(energy))
+        self._last_energy = energy[-1]
+
+        # Angular momentum about the hexagon centre, in the lab frame and
+        # relative to the rotating hexagon (v - omega x r)
+        angular_momentum = rx * vy - ry * vx
+        self.angular_momentum.update_chunk(angular_momentum)
+        if self._last_angle is not None:
+            omega = np.diff(angle, prepend=self._last_angle) / self.dt
+            relative = angular_momentum - omega * (rx * rx + ry * ry)
+        else:
+            omega = np.diff(angle) / self.dt
+            relative = angular_momentum[1:] - omega * (rx[1:] ** 2 + ry[1:] ** 2)
+        self.relative_angular_momentum.update_chunk(relative)
+        self._last_angle = angle[-1]
+
+        # Gap between the ball and the nearest wall, in the hexagon's frame
+        c, s = np.cos(angle), np.sin(angle)
+        local = np.empty((n, 2))
+        local[:, 0] = rx * c + ry * s
+        local[:, 1] = ry * c - rx * s
+        gap = self.apothem - (local @ self._normals).max(axis=1) - self.ball_radius
+        inside = gap > -self.ball_radius
+        self.escapes += int(n - np.count_nonzero(inside))
+        self.wall_gap.update_chunk(gap[inside])
+        self.wall_gap_histogram.update_chunk(gap[inside])
+
+        # Contacts and bounces (the first step of each run of contacts)
+        contact = gap <= self.contact_tolerance
+        self.contact_steps += int(np.count_nonzero(contact))
+        previous = np.empty(n, dtype=bool)
+        previous[0] = self._last_contact
+        previous[1:] = contact[:-1]
+        bounce_steps = np.flatnonzero(contact & ~previous) + self.steps
+        if len(bounce_steps):
+            if self._last_bounce_step is not None:
+                intervals = np.diff(bounce_steps, prepend=self._last_bounce_step) * self.dt
+            else:
+                intervals = np.diff(bounce_steps) * self.dt
+            self.bounce_interval.update_chunk(intervals)
+            self.bounce_interval_histogram.update_chunk(intervals)
+            self.bounces += len(bounce_steps)
+            self._last_bounce_step = int(bounce_steps[-1])
+        self._last_contact = bool(contact[-1])
+
+        self.steps += n
+
+    def summary(self):
+        """All metrics so far as plain Python values"""
+        self.flush()
+        return {
+            "steps": self.steps,
+            "simulated_time": self.steps * self.dt,
+            "energy": self.energy.as_dict(),
+            "energy_change": self.energy_change.as_dict(),
+            "speed": self.speed.as_dict(),
+            "angular_momentum": self.angular_momentum.as_dict(),
+            "relative_angular_momentum": self.relative_angular_momentum.as_dict(),
+            "wall_gap": self.wall_gap.as_dict(),
+            "wall_contact_fraction": self.contact_steps / self.steps if self.steps else 0.0,
+            "bounces": self.bounces,
+            "bounce_interval": self.bounce_interval.as_dict(),
+            "bounce_interval_histogram": self.bounce_interval_histogram.as_dict(),
+            "wall_gap_histogram": self.wall_gap_histogram.as_dict(),
+            "escapes": self.escapes,
+        }
+
+    def report(self):
+        """Human-readable summary"""
+        summary = self.summary()
+        lines = [f"Steps: {summary['steps']}  simulated time: {summary['simulated_time']:g}"]
+        for key in ("energy", "energy_change", "speed", "angular_momentum",
+                    "relative_angular_momentum", "wall_gap", "bounce_interval"):
+            stats = summary[key]
+            if stats["count"]:
+                lines.append(f"{key:<26} mean {stats['mean']:>11.4g}  std {stats['std']:>10.4g}"
+                             f"  min {stats['min']:>11.4g}  max {stats['max']:>11.4g}")
+        lines.append(f"{'wall_contact_fraction':<26} {summary['wall_contact_fraction']:.3f}")
+        lines.append(f"{'bounces':<26} {summary['bounces']}")
+        lines.append(f"{'escapes':<26} {summary['escapes']}")
+        return "\n".join(lines)
+
+
+class TrajectoryWriter:
+    """
+    Streams states to an (N, 5) .npy file that analyze_file() can read.
+
+    States are buffered and appended a chunk at a time; the array header is
+    written with a length of zero and rewritten with the real length by
+    close(), so the length doesn't have to be known up front.
+    """
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.steps = 0
+        self._file = open(path, "wb")
+        self._header_size = self._write_header(0)
+        self._buffer = np.empty((chunk_size, 5))
+        self._buffered = 0
+
+    def _write_header(self, steps):
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(
+            header, {"descr": "<f8", "fortran_order": False, "shape": (steps, 5)})
+        self._file.write(header.getvalue())
+        return len(header.getvalue())
+
+    def update(self, x, y, vx, vy, angle):
+        self._buffer[self._buffered] = (x, y, vx, vy, angle)
+        self._buffered += 1
+        if self._buffered == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._buffered:
+            self._file.write(self._buffer[:self._buffered].astype("<f8", copy=False).tobytes())
+            self.steps += self._buffered
+            self._buffered = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.seek(0)
+        if self._write_header(self.steps) != self._header_size:
+            raise ValueError(f"{self.path}: array header changed size")
+        self._file.close()
+
+
+def analyze_file(path, analyzer, chunk_size=CHUNK_SIZE):
+    """
+    Stream a recorded trajectory (.npy, shape (N, 5)) through an analyzer.
+    The file is memory-mapped, so only one chunk is resident at a time.
+    """
+    states = np.load(path, mmap_mode="r")
+    for start in range(0, len(states), chunk_size):
+        analyzer.update_chunk(states[start:start + chunk_size])
+    return analyzer
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python analytics.py TRAJECTORY.npy [CENTER_X CENTER_Y HEX_RADIUS BALL_RADIUS GRAVITY]")
+        sys.exit(1)
+    if len(sys.argv) >= 7:
+        cx, cy, hexagon_radius, ball_radius, gravity = map(float, sys.argv[2:7])
+    else:
+        # Defaults match sonnet-37.py
+        cx, cy, hexagon_radius, ball_radius, gravity = 400, 300, 200, 15, 0.5
+    analyzer = TrajectoryAnalyzer((cx, cy), hexagon_radius, ball_radius, gravity)
+    analyze_file(sys.argv[1], analyzer)
+    print(analyzer.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import importlib.util
+import math
+import os
+import sys
+import timeit
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# Constants
+# -----------------------------------------------------------------------------
+STEPS = 20000                 # Physics steps per timed run
+REPEATS = 5                   # Timed runs per implementation (best is kept)
+SONNET_37_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sonnet-37.py")
+
+
+def load_sonnet37():
+    """Import sonnet-37.py as a module (its file name is not a valid identifier)"""
+    spec = importlib.util.spec_from_file_location("sonnet_37", SONNET_37_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+s37 = load_sonnet37()
+
+
+# -----------------------------------------------------------------------------
+# Reference: the original per-edge NumPy step from sonnet-37.py
+# -----------------------------------------------------------------------------
+def get_hexagon_edges(rotation):
+    vertices = []
+    for i in range(6):
+        angle = rotation + i * (2 * math.pi / 6)
+        x = s37.hexagon_center[0] + s37.hexagon_radius * math.cos(angle)
+        y = s37.hexagon_center[1] + s37.hexagon_radius * math.sin(angle)
+        vertices.append(np.array([x, y]))
+    return [(vertices[i], vertices[(i + 1) % 6]) for i in range(6)]
+
+
+def distance_point_to_line(point, line_start, line_end):
+    line_vec = line_end - line_start
+    point_vec = point - line_start
+    line_len = np.linalg.norm(line_vec)
+    line_unitvec = line_vec / line_len
+    point_vec_scaled = point_vec / line_len
+    t = np.clip(np.dot(line_unitvec, point_vec_scaled), 0, 1)
+    nearest = line_start + t * line_vec
+    dist = np.linalg.norm(nearest - point)
+    return dist, nearest
+
+
+def reflect_velocity(velocity, normal):
+    normal = normal / np.linalg.norm(normal)
+    return velocity - 2 * np.dot(velocity, normal) * normal
+
+
+def run_reference(steps):
+    ball_pos = np.array(s37.BALL_START_POS, dtype=float)
+    ball_vel = np.array(s37.BALL_START_VEL, dtype=float)
+    rotation = 0
+    for _ in range(steps):
+        rotation += s37.HEXAGON_ROTATION_SPEED
+        ball_vel[1] += s37.GRAVITY
+        ball_pos += ball_vel
+        for edge_start, edge_end in get_hexagon_edges(rotation):
+            distance, nearest = distance_point_to_line(ball_pos, edge_start, edge_end)
+            if distance <= s37.ball_radius:
+                edge_vec = edge_end - edge_start
+                normal = np.array([-edge_vec[1], edge_vec[0]])
+                normal = normal / np.linalg.norm(normal)
+                if np.dot(normal, ball_pos - nearest) < 0:
+                    normal = -normal
+                overlap = s37.ball_radius - distance
+                ball_pos += overlap * normal
+                ball_vel = reflect_velocity(ball_vel, normal) * s37.RESTITUTION
+                parallel = np.array([normal[1], -normal[0]])
+                parallel_component = np.dot(ball_vel, parallel) * parallel
+                perpendicular_component = ball_vel - parallel_component
+                ball_vel = perpendicular_component + parallel_component * s37.FRICTION
+    return ball_pos, ball_vel
+
+
+# -----------------------------------------------------------------------------
+# Scalar: the original algorithm on plain floats, vertices recomputed each step
+# -----------------------------------------------------------------------------
+def run_scalar(steps):
+    cx, cy = float(s37.hexagon_center[0]), float(s37.hexagon_center[1])
+    radius = s37.hexagon_radius
+    ball_radius = s37.ball_radius
+    x, y = map(float, s37.BALL_START_POS)
+    vx, vy = map(float, s37.BALL_START_VEL)
+    rotation = 0
+    for _ in range(steps):
+        rotation += s37.HEXAGON_ROTATION_SPEED
+        vy += s37.GRAVITY
+        x += vx
+        y += vy
+        vertices = []
+        for i in range(6):
+            angle = rotation + i * (2 * math.pi / 6)
+            vertices.append((cx + radius * math.cos(angle), cy + radius * math.sin(angle)))
+        for i in range(6):
+            x1, y1 = vertices[i]
+            x2, y2 = vertices[(i + 1) % 6]
+            ex, ey = x2 - x1, y2 - y1
+            length_sq = ex * ex + ey * ey
+            t = max(0.0, min(1.0, ((x - x1) * ex + (y - y1) * ey) / length_sq))
+            qx, qy = x1 + t * ex, y1 + t * ey
+            distance = math.hypot(qx - x, qy - y)
+            if distance <= ball_radius:
+                length = math.sqrt(length_sq)
+                nx, ny = -ey / length, ex / length
+                if nx * (x - qx) + ny * (y - qy) < 0:
+                    nx, ny = -nx, -ny
+                overlap = ball_radius - distance
+                x += overlap * nx
+                y += overlap * ny
+                vn = 2 * (vx * nx + vy * ny)
+                vx = (vx - vn * nx) * s37.RESTITUTION
+                vy = (vy - vn * ny) * s37.RESTITUTION
+                vp = (vx * ny - vy * nx) * (1 - s37.FRICTION)
+                vx -= vp * ny
+                vy += vp * nx
+    return np.array([x, y]), np.array([vx, vy])
+
+
+# -----------------------------------------------------------------------------
+# Vectorized: the collider's algorithm in NumPy, all six edges tested at once
+# -----------------------------------------------------------------------------
+class VectorizedCollider(s37.HexagonCollider):
+    """
+    NumPy alternative to HexagonCollider.bounce on preallocated buffers.
+
+    One matrix product projects the ball onto all six edges, and the
+    distance and hit test runs on the whole 6-vector.  Edges are resolved
+    in order from the first hit, since each bounce shifts the ball relative
+    to the edges after it.
+    """
+
+    def __init__(self, center, radius, ball_radius):
+        super().__init__(center, radius, ball_radius)
+        edges = np.array(self.edges)
+
+        # Rows 0-5 project the homogeneous local position [x, y, 1] along
+        # each edge (measured from its start), rows 6-11 across it
+        self._proj = np.empty((12, 3))
+        self._proj[:6, :2] = edges[:, 0:2]
+        self._proj[:6, 2] = -edges[:, 4]
+        self._proj[6:, :2] = edges[:, 2:4]
+        self._proj[6:, 2] = -edges[:, 5]
+
+        # Scratch buffers
+        self._local = np.ones(3)
+        self._out = np.empty(12)
+        self._beyond = np.empty(6)
+        self._distance_sq = np.empty(6)
+        self._scratch = np.empty(6)
+        self._hits = np.empty(6, dtype=bool)
+
+    def bounce(self, x, y, vx, vy, rotation):
+        c, s = math.cos(rotation), math.sin(rotation)
+        rx, ry = x - self.cx, y - self.cy
+        local = self._local
+        local[0] = rx * c + ry * s
+        local[1] = ry * c - rx * s
+        out = self._out
+        np.dot(self._proj, local, out=out)
+        along, across = out[:6], out[6:]
+
+        # Distance to every edge segment, then the hit test, in one pass each
+        beyond, distance_sq, scratch = self._beyond, self._distance_sq, self._scratch
+        np.clip(along, 0.0, self.side, out=beyond)
+        np.subtract(along, beyond, out=beyond)
+        np.multiply(beyond, beyond, out=distance_sq)
+        np.multiply(across, across, out=scratch)
+        distance_sq += scratch
+        r2 = self.ball_radius * self.ball_radius
+        np.less_equal(distance_sq, r2, out=self._hits)
+        if not self._hits.any():
+            return x, y, vx, vy
+
+        first = int(self._hits.argmax())
+        projections = out.tolist()
+        distances = distance_sq.tolist()
+        shift_x = shift_y = 0.0  # Local-frame displacement from earlier bounces
+        for edge in range(first, 6):
+            dx, dy, nx, ny, _, _ = self.edges[edge]
+            if edge == first:
+                across = projections[edge + 6]
+                distance_sq = distances[edge]
+            else:
+                along = projections[edge] + shift_x * dx + shift_y * dy
+                across = projections[edge + 6] + shift_x * nx + shift_y * ny
+                beyond = along - min(max(along, 0.0), self.side)
+                distance_sq = beyond * beyond + across * across
+                if distance_sq > r2:
+                    continue
+            if across < 0:
+                nx, ny = -nx, -ny
+            overlap = self.ball_radius - math.sqrt(distance_sq)
+            shift_x += overlap * nx
+            shift_y += overlap * ny
+            nx, ny = nx * c - ny * s, nx * s + ny * c
+            x += overlap * nx
+            y += overlap * ny
+            vn = 2 * (vx * nx + vy * ny)
+            vx = (vx - vn * nx) * s37.RESTITUTION
+            vy = (vy - vn * ny) * s37.RESTITUTION
+            vp = (vx * ny - vy * nx) * (1 - s37.FRICTION)
+            vx -= vp * ny
+            vy += vp * nx
+        return x, y, vx, vy
+
+
+def run_collider(steps, collider_class=s37.HexagonCollider):
+    collider = collider_class(s37.hexagon_center, s37.hexagon_radius, s37.ball_radius)
+    ball_pos = np.array(s37.BALL_START_POS, dtype=float)
+    ball_vel = np.array(s37.BALL_START_VEL, dtype=float)
+    rotation = 0
+    for _ in range(steps):
+        rotation += s37.HEXAGON_ROTATION_SPEED
+        collider.step(ball_pos, ball_vel, rotation)
+    return ball_pos, ball_vel
+
+
+IMPLEMENTATIONS = [
+    ("numpy (original)", run_reference),
+    ("scalar, per-step trig", run_scalar),
+    ("vectorized numpy kernel", lambda steps: run_collider(steps, VectorizedCollider)),
+    ("HexagonCollider", run_collider),
+]
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else STEPS
+
+    # Check all implementations agree over a shorter run before timing them
+    check_steps = min(steps, 2000)
+    expected_pos, expected_vel = run_reference(check_steps)
+    for name, run in IMPLEMENTATIONS[1:]:
+        pos, vel = run(check_steps)
+        error = max(np.abs(pos - expected_pos).max(), np.abs(vel - expected_vel).max())
+        print(f"{name:<24} max deviation from original after {check_steps} steps: {error:.2e}")
+    print()
+
+    results = []
+    for name, run in IMPLEMENTATIONS:
+        best = min(timeit.repeat(lambda: run(steps), number=1, repeat=REPEATS))
+        results.append((name, best))
+
+    baseline = results[0][1]
+    print(f"{'implementation':<24} {'us/step':>10} {'speedup':>10}")
+    for name, best in results:
+        print(f"{name:<24} {best / steps * 1e6:>10.2f} {baseline / best:>9.2f}x")
+
+    timings = dict(results)
+    ratio = timings["vectorized numpy kernel"] / timings["HexagonCollider"]
+    if ratio > 1:
+        print(f"\nThe vectorized kernel is {ratio:.2f}x slower than HexagonCollider on plain floats:"
+              " for a single ball, NumPy's per-call overhead outweighs the six-edge arithmetic.")
+    else:
+        print(f"\nThe vectorized kernel is {1 / ratio:.2f}x faster than HexagonCollider on plain floats.")
+
+
+if __name__ == "__main__":
+    main()
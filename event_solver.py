@@ -0,0 +1,434 @@
+import cmath
+import math
+import sys
+import time
+
+import numpy as np
+
+import o1
+from analytics import TrajectoryAnalyzer
+
+# -----------------------------------------------------------------------------
+# Constants
+# -----------------------------------------------------------------------------
+FLIGHT_WINDOW = 32            # Frames of free flight checked for a collision at a time
+SLIDE_WINDOW = 128            # Frames of sliding contact evaluated at a time
+SAMPLE_CHUNK = 4096           # Samples handed to the sink at a time
+CHECK_FRAMES = 20000          # Frames compared against o1.py's own loop by main()
+TRACK_FRAMES = 300            # Leading frames whose positions must agree exactly
+TRACK_TOLERANCE = 1e-6        # Position difference (pixels) allowed over those frames
+STAT_TOLERANCE = 0.05         # Relative difference allowed in long-run statistics
+COMPARED_STATS = ("wall_contact_fraction", "speed", "wall_gap", "energy")
+
+SIXTH = math.pi / 3
+
+
+class EventDrivenSimulation:
+    """
+    o1.py's ball and spinning hexagon, advanced from one collision to the
+    next instead of frame by frame.
+
+    Between collisions each o1.py frame only adds gravity, scales the
+    velocity by (1 - FRICTION) and moves the ball, so free flight is stepped
+    on plain floats with a constant-time contact test instead of o1.py's six
+    segment checks.  The frame the ball touches a wall is resolved with
+    o1.py's own collision code: a static edge normal, with the whole
+    velocity scaled by RESTITUTION.
+
+    Most of o1.py's frames are spent sliding along one wall, colliding with
+    it every frame.  Seen from the hexagon, each of those frames applies the
+    same affine map to the ball's state plus a gravity term turning with
+    the hexagon, so the map's powers are precomputed per wall and a slide
+    is jumped through up to the last frame that is still a contact with
+    that wall's face alone.  Time is measured in o1.py's frames.
+    """
+
+    def __init__(self, gravity=o1.GRAVITY, friction=o1.FRICTION, restitution=o1.RESTITUTION,
+                 hex_radius=o1.HEX_RADIUS, rotation_speed=o1.HEX_ROTATION_SPEED,
+                 ball_radius=o1.BALL_RADIUS, center=(o1.WIDTH // 2, o1.HEIGHT // 2),
+                 position=(o1.WIDTH // 2, o1.HEIGHT // 2 - 50), velocity=o1.INIT_BALL_VEL):
+        self.gravity = gravity
+        self.factor = 1 - friction                    # Per-frame velocity factor
+        self.restitution = restitution
+        self.hex_radius = hex_radius
+        self.omega = rotation_speed
+        self.ball_radius = ball_radius
+        self.cx, self.cy = center
+        self._limit = hex_radius * math.cos(math.pi / 6) - ball_radius
+        self._clear_sq = self._limit * self._limit    # Clear of every wall inside this
+
+        # Current state, relative to the hexagon centre, after frame self.frame
+        self.frame = 0
+        self.x = position[0] - self.cx
+        self.y = position[1] - self.cy
+        self.vx, self.vy = map(float, velocity)
+        self._wall = None             # The only wall hit this frame, if just one was
+
+        self.collisions = 0
+        self.flights = 0
+        self.slides = 0
+
+        # Walls in the hexagon's own frame: a position q lies q @ axes - offsets
+        # along each wall from its first vertex (columns 0-5) and inside it
+        # (columns 6-11)
+        angles = np.arange(7) * (2 * math.pi / 6)
+        vertices = hex_radius * np.column_stack((np.cos(angles), np.sin(angles)))
+        dirs = np.diff(vertices, axis=0) / hex_radius
+        normals = np.column_stack((-dirs[:, 1], dirs[:, 0]))     # Pointing inwards
+        self._axes = np.hstack((dirs.T, normals.T))
+        self._offsets = np.concatenate((np.einsum("ij,ij->i", vertices[:6], dirs),
+                                        np.einsum("ij,ij->i", vertices[:6], normals)))
+        self._normals = normals
+
+        # Re-expresses a hexagon-frame row vector in the next frame's
+        # hexagon coordinates, the hexagon having turned by omega
+        c, s = math.cos(self.omega), math.sin(self.omega)
+        self._turn = np.array([[c, -s], [s, c]])
+        self._slide_maps = [self._contact_powers(wall) for wall in range(6)]
+
+    # -------------------------------------------------------------------------
+    # Free flight
+    # -------------------------------------------------------------------------
+    def _touching(self, x, y, frame):
+        """
+        Whether o1.py would find a collision at position x, y in frame.
+
+        Inside a regular hexagon, the nearest wall is the one whose sector
+        (between the centre and its two vertices) holds the ball, and the
+        ball's foot on that wall lies within it, so one distance decides.
+        """
+        if x * x + y * y < self._clear_sq:
+            return False
+        phi = math.atan2(y, x) - self.omega * frame - math.pi / 6
+        phi -= round(phi / SIXTH) * SIXTH
+        return math.hypot(x, y) * math.cos(phi) >= self._limit
+
+    def _touches_next(self):
+        """Whether the next frame of free flight touches a wall"""
+        vx = self.vx * self.factor
+        vy = (self.vy + self.gravity) * self.factor
+        return self._touching(self.x + vx, self.y + vy, self.frame + 1)
+
+    def _fly(self, frames, sampler):
+        """
+        Step free flight on plain floats for up to frames frames, stopping
+        at the first frame where the ball touches a wall.  Returns True if it
+        did.
+        """
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        frame = self.frame
+        touching = False
+        for frame in range(self.frame + 1, self.frame + frames + 1):
+            if sampler:
+                sampler.record(frame - 1, x + self.cx, y + self.cy, vx, vy,
+                               self.omega * (frame - 1))
+            vy += self.gravity
+            vx *= self.factor
+            vy *= self.factor
+            x += vx
+            y += vy
+            if self._touching(x, y, frame):
+                touching = True
+                break
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+        self.frame = frame
+        self.flights += 1
+        return touching
+
+    def _collide(self):
+        """o1.py's collision response for the current frame"""
+        vertices = o1.create_hexagon_vertices(0.0, 0.0, self.hex_radius, self.omega * self.frame)
+        walls = []
+        for i in range(6):
+            collision, info = o1.line_collision_with_circle(
+                vertices[i], vertices[(i + 1) % 6], (self.x, self.y), self.ball_radius)
+            if collision:
+                cx, cy, nx, ny = info
+                overlap = self.ball_radius - math.sqrt((self.x - cx) ** 2 + (self.y - cy) ** 2)
+                self.x += nx * overlap
+                self.y += ny * overlap
+                vel_dot_n = self.vx * nx + self.vy * ny
+                self.vx = (self.vx - 2 * vel_dot_n * nx) * self.restitution
+                self.vy = (self.vy - 2 * vel_dot_n * ny) * self.restitution
+                walls.append(i)
+        self.collisions += len(walls)
+        self._wall = walls[0] if len(walls) == 1 else None
+
+    # -------------------------------------------------------------------------
+    # Sliding contact
+    # -------------------------------------------------------------------------
+    def _contact_powers(self, wall):
+        """
+        One frame of contact with wall's face, in the hexagon's frame, is
+        z' = A z + B f + b for the state z = (position, velocity) and the
+        frame's gravity f.  f turns with the hexagon: at frame k it is the
+        real part of F e^(i omega k).  Returns A^n, the accumulated gravity
+        terms W_n (for a slide starting at frame 0) and the accumulated
+        constant terms for n = 1 .. SLIDE_WINDOW.
+        """
+        normal = self._normals[wall]
+        inside = self.hex_radius * math.cos(math.pi / 6)       # Apothem
+        push = np.eye(2) - np.outer(normal, normal)              # Onto the wall's line
+        reflect = np.eye(2) - 2 * np.outer(normal, normal)
+        turn = self._turn.T                                      # Acting on columns
+
+        # Gravity f enters both the moved position and the velocity, before
+        # the push and the reflection
+        a = np.zeros((4, 4))
+        a[:2, :2] = push @ turn
+        a[:2, 2:] = self.factor * push @ turn
+        a[2:, 2:] = self.restitution * self.factor * reflect @ turn
+        b = np.vstack((push, self.restitution * reflect))
+        constant = np.concatenate((normal * (self.ball_radius - inside), np.zeros(2)))
+        gravity = self.factor * self.gravity * np.array([-1j, 1.0])
+
+        powers = np.empty((SLIDE_WINDOW, 4, 4))
+        turning = np.empty((SLIDE_WINDOW, 4), dtype=complex)
+        constants = np.empty((SLIDE_WINDOW, 4))
+        power, w, total = np.eye(4), np.zeros(4, dtype=complex), np.zeros(4)
+        for n in range(SLIDE_WINDOW):
+            power = a @ power
+            w = a @ w + b @ gravity * cmath.exp(1j * self.omega * (n + 1))
+            total = a @ total + constant
+            powers[n], turning[n], constants[n] = power, w, total
+        return powers, turning, constants
+
+    def _project(self, positions):
+        """Positions along and inside each wall, and squared distances to them"""
+        projections = positions @ self._axes - self._offsets
+        along, inside = projections[:, :6], projections[:, 6:]
+        beyond = along - np.minimum(np.maximum(along, 0.0), self.hex_radius)
+        return along, inside, beyond * beyond + inside * inside
+
+    def _slide(self, frames, sampler):
+        """
+        Follow a slide along self._wall for up to frames frames, stopping
+        after the last frame that is a contact with that wall's face alone.
+        Returns the number of frames advanced.
+        """
+        wall = self._wall
+        powers, turning, constants = self._slide_maps[wall]
+        frames = min(frames, SLIDE_WINDOW)
+        start = self.frame
+        c, s = math.cos(self.omega * start), math.sin(self.omega * start)
+        state = np.array([self.x * c + self.y * s, self.y * c - self.x * s,
+                          self.vx * c + self.vy * s, self.vy * c - self.vx * s])
+        states = np.empty((frames + 1, 4))
+        states[0] = state
+        states[1:] = (powers[:frames] @ state + constants[:frames]
+                      + (turning[:frames] * cmath.exp(1j * self.omega * start)).real)
+
+        # Where each frame moved the ball before the push, to check it
+        # really was that contact and no other
+        angle = self.omega * (start + np.arange(frames + 1.0))
+        gravity = self.factor * self.gravity * np.column_stack((np.sin(angle[1:]), np.cos(angle[1:])))
+        moved = states[:-1] @ np.vstack((self._turn, self.factor * self._turn)) + gravity
+        along, inside, before = self._project(moved)
+        _, _, after = self._project(states[1:, :2])
+        r2 = self.ball_radius * self.ball_radius
+        valid = ((along[:, wall] >= 0) & (along[:, wall] <= self.hex_radius)
+                 & (inside[:, wall] > 0) & (before[:, wall] <= r2)
+                 & (before[:, :wall] > r2).all(axis=1)         # o1.py checks these before
+                 & (after[:, wall + 1:] > r2).all(axis=1))     # and these after the push
+        step = frames if valid.all() else int(valid.argmin())
+
+        c, s = np.cos(angle[:step + 1]), np.sin(angle[:step + 1])
+        qx, qy, ux, uy = states[:step + 1].T
+        x, y = qx * c - qy * s, qx * s + qy * c
+        vx, vy = ux * c - uy * s, ux * s + uy * c
+        if sampler:
+            sampler.add(start, x[:step] + self.cx, y[:step] + self.cy,
+                        vx[:step], vy[:step], angle[:step])
+        self.x, self.y, self.vx, self.vy = x[step], y[step], vx[step], vy[step]
+        self.frame += step
+        self.collisions += step
+        self.slides += 1
+        return step
+
+    # -------------------------------------------------------------------------
+    # Driver
+    # -------------------------------------------------------------------------
+    def run(self, frames, sample_interval=None, sink=None):
+        """
+        Simulate frames frames.  If sample_interval (whole frames) is given,
+        the state at every multiple of it is passed to sink as an (N, 5)
+        array of x, y, vx, vy and hexagon rotation, in screen coordinates.
+        """
+        end = self.frame + frames
+        sampler = _Sampler(sample_interval, sink) if sample_interval and sink else None
+        while self.frame < end:
+            remaining = end - self.frame
+            if self._wall is not None:
+                # Most bounces leave the wall; only slide if the next frame is a contact too
+                if (not self._touches_next()
+                        or self._slide(remaining, sampler) < min(remaining, SLIDE_WINDOW)):
+                    self._wall = None
+            elif self._fly(remaining, sampler):
+                self._collide()
+        if sampler:
+            sampler.flush()
+
+
+class _Sampler:
+    """Collects the state at every interval-th frame and hands it to the sink in chunks"""
+
+    def __init__(self, interval, sink):
+        self.interval = int(interval)
+        self.sink = sink
+        self.buffer = np.empty((SAMPLE_CHUNK, 5))
+        self.count = 0
+
+    def record(self, frame, x, y, vx, vy, angle):
+        """Record the state of a single frame"""
+        if frame % self.interval:
+            return
+        if self.count == SAMPLE_CHUNK:
+            self.flush()
+        self.buffer[self.count] = (x, y, vx, vy, angle)
+        self.count += 1
+
+    def add(self, first_frame, x, y, vx, vy, angle):
+        """Record the states of consecutive frames from first_frame on"""
+        offset = -first_frame % self.interval
+        if offset >= len(x):
+            return
+        rows = np.column_stack((x, y, vx, vy, angle))[offset::self.interval]
+        if self.count + len(rows) > SAMPLE_CHUNK:
+            self.flush()
+        self.buffer[self.count:self.count + len(rows)] = rows
+        self.count += len(rows)
+
+    def flush(self):
+        if self.count:
+            self.sink(self.buffer[:self.count])
+            self.count = 0
+
+
+def run_fixed_step(frames, analyzer=None):
+    """
+    o1.py's own per-frame physics, without drawing, for comparison.
+    If an analyzer is given, it receives the state of every frame from 0 on.
+    """
+    ball_x, ball_y = o1.WIDTH // 2, o1.HEIGHT // 2 - 50
+    ball_vx, ball_vy = o1.INIT_BALL_VEL
+    hex_angle = 0.0
+    center_x, center_y = o1.WIDTH // 2, o1.HEIGHT // 2
+    for _ in range(frames):
+        if analyzer:
+            analyzer.update(ball_x, ball_y, ball_vx, ball_vy, hex_angle)
+        ball_vy += o1.GRAVITY
+        ball_vx *= 1 - o1.FRICTION
+        ball_vy *= 1 - o1.FRICTION
+        ball_x += ball_vx
+        ball_y += ball_vy
+        hex_angle += o1.HEX_ROTATION_SPEED
+        vertices = o1.create_hexagon_vertices(center_x, center_y, o1.HEX_RADIUS, hex_angle)
+        for i in range(len(vertices)):
+            collision, info = o1.line_collision_with_circle(
+                vertices[i], vertices[(i + 1) % len(vertices)], (ball_x, ball_y), o1.BALL_RADIUS)
+            if collision:
+                cx, cy, nx, ny = info
+                overlap = o1.BALL_RADIUS - math.sqrt((ball_x - cx) ** 2 + (ball_y - cy) ** 2)
+                ball_x += nx * overlap
+                ball_y += ny * overlap
+                vel_dot_n = o1.dot((ball_vx, ball_vy), (nx, ny))
+                ball_vx -= 2 * vel_dot_n * nx
+                ball_vy -= 2 * vel_dot_n * ny
+                ball_vx *= o1.RESTITUTION
+                ball_vy *= o1.RESTITUTION
+    return ball_x, ball_y
+
+
+class _Path:
+    """Stands in for an analyzer to collect the positions run_fixed_step visits"""
+
+    def __init__(self):
+        self.points = []
+
+    def update(self, x, y, vx, vy, angle):
+        self.points.append((x, y))
+
+
+def make_analyzer():
+    return TrajectoryAnalyzer((o1.WIDTH // 2, o1.HEIGHT // 2), o1.HEX_RADIUS,
+                              o1.BALL_RADIUS, o1.GRAVITY)
+
+
+def check_against_fixed_step(frames=CHECK_FRAMES):
+    """
+    Compare the solver with o1.py's loop: positions over the first
+    TRACK_FRAMES frames, then long-run statistics over frames frames.
+    Returns (passed, report lines).
+    """
+    lines = []
+    passed = True
+
+    # Leading frames: both must follow the same path
+    path = _Path()
+    run_fixed_step(TRACK_FRAMES, path)
+    samples = []
+    EventDrivenSimulation().run(TRACK_FRAMES, sample_interval=1,
+                                sink=lambda rows: samples.append(rows.copy()))
+    deviation = np.abs(np.vstack(samples)[:, :2] - np.array(path.points)).max()
+    ok = deviation <= TRACK_TOLERANCE
+    passed &= ok
+    lines.append(f"first {TRACK_FRAMES} frames: max position difference {deviation:.2e} px"
+                 f"  {'ok' if ok else 'FAIL'}")
+
+    # Long run: the paths diverge chaotically, the statistics must not
+    fixed = make_analyzer()
+    run_fixed_step(frames, fixed)
+    sampled = make_analyzer()
+    EventDrivenSimulation().run(frames, sample_interval=1, sink=sampled.update_chunk)
+    fixed_summary, sampled_summary = fixed.summary(), sampled.summary()
+    lines.append(f"{'statistic over ' + str(frames) + ' frames':<32} {'o1.py':>10} {'solver':>10}")
+    for key in COMPARED_STATS:
+        expected, actual = fixed_summary[key], sampled_summary[key]
+        if isinstance(expected, dict):
+            expected, actual = expected["mean"], actual["mean"]
+            key += " mean"
+        ok = abs(actual - expected) <= STAT_TOLERANCE * abs(expected)
+        passed &= ok
+        lines.append(f"{key:<32} {expected:>10.4g} {actual:>10.4g}  {'ok' if ok else 'FAIL'}")
+    return passed, lines
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 216000   # One hour at 60 FPS
+
+    passed, lines = check_against_fixed_step()
+    print("\n".join(lines))
+    print()
+
+    simulation = EventDrivenSimulation()
+    start = time.process_time()
+    simulation.run(frames)
+    event_time = time.process_time() - start
+
+    analyzer = make_analyzer()
+    start = time.process_time()
+    EventDrivenSimulation().run(frames, sample_interval=1, sink=analyzer.update_chunk)
+    sampled_time = time.process_time() - start
+
+    fixed_frames = min(frames, CHECK_FRAMES)
+    start = time.process_time()
+    run_fixed_step(fixed_frames)
+    fixed_time = time.process_time() - start
+
+    fixed_rate = fixed_frames / fixed_time
+    print(f"Simulated {frames} frames: {simulation.collisions} collisions, "
+          f"{simulation.flights} flight and {simulation.slides} slide jumps")
+    print(f"{'mode':<28} {'frames per CPU second':>22} {'speedup':>9}")
+    print(f"{'o1.py fixed step':<28} {fixed_rate:>22,.0f} {1:>8.1f}x")
+    for name, elapsed in (("event-driven", event_time), ("event-driven + sampling", sampled_time)):
+        rate = frames / elapsed
+        print(f"{name:<28} {rate:>22,.0f} {rate / fixed_rate:>8.1f}x")
+    print()
+    print(analyzer.report())
+
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pygame
+
+from registry import ROOT_DIR, EntryRegistry
+from runner import DEFAULT_TIMEOUT, run_submission
+
+# -----------------------------------------------------------------------------
+# Constants
+# -----------------------------------------------------------------------------
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+DIFF_DIR = os.path.join(GOLDEN_DIR, "diffs")
+DEFAULT_STEPS = [1, 30, 120, 300]   # Frames captured when recording
+DEFAULT_ATOL = 8                    # Per-channel difference tolerated per pixel
+DEFAULT_MAX_MISMATCH = 0.0001       # Fraction of pixels allowed over the tolerance
+
+
+def frame_hash(frame):
+    """
+    Fast screening hash of a (width, height, 3) uint8 frame.
+
+    CRC-32 runs at several GB/s, enough to screen thousands of full frames
+    per second; identical hashes are taken as identical frames, anything
+    else falls through to the tolerance comparison.
+    """
+    frame = np.ascontiguousarray(frame, dtype=np.uint8)
+    return f"{frame.shape[0]}x{frame.shape[1]}:{zlib.crc32(frame):08x}"
+
+
+def compare_frames(frame, golden, atol=DEFAULT_ATOL, max_mismatch=DEFAULT_MAX_MISMATCH):
+    """
+    Compare a frame against its golden copy.
+    Returns a dict with "match" and the statistics it was decided on; the
+    per-pixel difference is included as "diff" for heatmaps.
+    """
+    if frame.shape != golden.shape:
+        return {"match": False, "reason": f"shape {frame.shape} != {golden.shape}"}
+    diff = np.abs(frame.astype(np.int16) - golden.astype(np.int16)).max(axis=2)
+    mismatch = np.count_nonzero(diff > atol) / diff.size
+    return {
+        "match": mismatch <= max_mismatch,
+        "max_diff": int(diff.max()),
+        "mean_diff": float(diff.mean()),
+        "mismatch_fraction": mismatch,
+        "diff": diff,
+    }
+
+
+def diff_heatmap(diff, golden):
+    """
+    Render a difference map as an RGB image: the golden frame dimmed to grey,
+    with differing pixels in red to yellow by magnitude.
+    """
+    heatmap = np.empty(golden.shape, dtype=np.uint8)
+    heatmap[:] = (golden.mean(axis=2, keepdims=True) * 0.3).astype(np.uint8)
+    changed = diff > 0
+    scaled = np.minimum(diff.astype(np.uint16) * 4, 255).astype(np.uint8)
+    heatmap[changed, 0] = 255
+    heatmap[changed, 1] = scaled[changed]
+    heatmap[changed, 2] = 0
+    return heatmap
+
+
+def save_heatmap(diff, golden, path):
+    pygame.image.save(pygame.surfarray.make_surface(diff_heatmap(diff, golden)), path)
+
+
+def golden_key(entry_path):
+    """
+    Entry path relative to the repository, without its extension, so that
+    entries with the same name in different directories don't share files.
+    Entries outside the repository are keyed by file name under _external/.
+    """
+    rel_path = os.path.relpath(os.path.abspath(entry_path), ROOT_DIR)
+    if rel_path.startswith(os.pardir):
+        rel_path = os.path.join("_external", os.path.basename(entry_path))
+    return os.path.splitext(rel_path)[0]
+
+
+def golden_paths(entry_path):
+    base = os.path.join(GOLDEN_DIR, golden_key(entry_path))
+    return base + ".npz", base + ".json"
+
+
+def capture_frames(entry_path, steps, timeout=DEFAULT_TIMEOUT):
+    """
+    Run an entry headlessly with a fixed seed and capture the given frames.
+    Returns (runner result, {step: frame}).
+    """
+    capture_dir = tempfile.mkdtemp(prefix="golden-")
+    try:
+        result = run_submission(entry_path, frames=max(steps), timeout=timeout, extra_env={
+            "SHIM_CAPTURE": ",".join(str(step) for step in steps),
+            "SHIM_CAPTURE_DIR": capture_dir,
+        })
+        frames = {}
+        for step in steps:
+            path = os.path.join(capture_dir, f"frame_{step:06d}.npy")
+            if os.path.exists(path):
+                frames[step] = np.load(path)
+        return result, frames
+    finally:
+        shutil.rmtree(capture_dir, ignore_errors=True)
+
+
+def record(entry_path, steps=DEFAULT_STEPS, timeout=DEFAULT_TIMEOUT):
+    """Capture and store the golden frames for an entry"""
+    result, frames = capture_frames(entry_path, steps, timeout)
+    if result["status"] != "ok" or not frames:
+        return {"file": entry_path, "status": "error", "detail": result.get("error", result["status"])}
+
+    frames_path, hashes_path = golden_paths(entry_path)
+    os.makedirs(os.path.dirname(frames_path), exist_ok=True)
+    np.savez_compressed(frames_path, **{f"frame_{step:06d}": frame for step, frame in frames.items()})
+    with open(hashes_path, "w", encoding="utf-8") as f:
+        json.dump({str(step): frame_hash(frame) for step, frame in sorted(frames.items())}, f, indent=1)
+    return {"file": entry_path, "status": "recorded", "steps": sorted(frames)}
+
+
+def check(entry_path, atol=DEFAULT_ATOL, max_mismatch=DEFAULT_MAX_MISMATCH,
+          timeout=DEFAULT_TIMEOUT, heatmaps=True):
+    """
+    Re-render an entry and compare it with its golden frames.
+    Frames whose hash matches are accepted without loading the golden image.
+    """
+    frames_path, hashes_path = golden_paths(entry_path)
+    try:
+        with open(hashes_path, encoding="utf-8") as f:
+            hashes = {int(step): value for step, value in json.load(f).items()}
+    except OSError:
+        return {"file": entry_path, "status": "missing"}
+
+    result, frames = capture_frames(entry_path, sorted(hashes), timeout)
+    failures = []
+    details = {}
+    golden_frames = None
+    for step, expected_hash in sorted(hashes.items()):
+        frame = frames.get(step)
+        if frame is None:
+            failures.append(step)
+            details[step] = {"match": False, "reason": f"not rendered ({result['status']})"}
+            continue
+        if frame_hash(frame) == expected_hash:
+            details[step] = {"match": True, "exact": True}
+            continue
+
+        try:
+            if golden_frames is None:
+                golden_frames = np.load(frames_path)
+            golden = golden_frames[f"frame_{step:06d}"]
+        except OSError:
+            return {"file": entry_path, "status": "missing", "detail": f"{frames_path} not found"}
+        except KeyError:
+            return {"file": entry_path, "status": "missing",
+                    "detail": f"frame {step} not in {frames_path}"}
+        comparison = compare_frames(frame, golden, atol, max_mismatch)
+        diff = comparison.pop("diff", None)
+        details[step] = comparison
+        if not comparison["match"]:
+            failures.append(step)
+            if heatmaps and diff is not None:
+                heatmap_path = os.path.join(DIFF_DIR, f"{golden_key(entry_path)}_frame_{step:06d}.png")
+                os.makedirs(os.path.dirname(heatmap_path), exist_ok=True)
+                save_heatmap(diff, golden, heatmap_path)
+                comparison["heatmap"] = heatmap_path
+
+    return {"file": entry_path, "status": "fail" if failures else "pass",
+            "failed_steps": failures, "steps": details}
+
+
+def format_results(results):
+    lines = []
+    for result in results:
+        name = os.path.relpath(os.path.abspath(result["file"]), ROOT_DIR)
+        line = f"{name:<32} {result['status']}"
+        if result.get("failed_steps"):
+            line += "  frames " + ", ".join(str(step) for step in result["failed_steps"])
+        elif result.get("detail"):
+            line += f"  {result['detail'].strip().splitlines()[-1]}"
+        lines.append(line)
+        for step in result.get("failed_steps", []):
+            detail = result["steps"][step]
+            if "mismatch_fraction" in detail:
+                lines.append(f"    frame {step}: {detail['mismatch_fraction']:.2%} of pixels differ,"
+                             f" max diff {detail['max_diff']}  {detail.get('heatmap', '')}")
+            else:
+                lines.append(f"    frame {step}: {detail.get('reason', '')}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or check golden frames of entries.")
+    parser.add_argument("command", choices=["record", "check"])
+    parser.add_argument("files", nargs="*", help="entry scripts (default: every discovered entry)")
+    parser.add_argument("--steps", default=",".join(map(str, DEFAULT_STEPS)),
+                        help="comma-separated frames to record")
+    parser.add_argument("--atol", type=int, default=DEFAULT_ATOL, help="per-channel tolerance")
+    parser.add_argument("--max-mismatch", type=float, default=DEFAULT_MAX_MISMATCH,
+                        help="fraction of pixels allowed over the tolerance")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per entry")
+    parser.add_argument("--workers", type=int, default=None, help="entries run in parallel")
+    args = parser.parse_args()
+
+    paths = args.files or [entry["path"] for entry in EntryRegistry().scan()]
+    if args.command == "record":
+        steps = sorted({int(step) for step in args.steps.split(",")})
+        task = lambda path: record(path, steps, args.timeout)
+    else:
+        task = lambda path: check(path, args.atol, args.max_mismatch, args.timeout)
+
+    with ThreadPoolExecutor(max_workers=args.workers or os.cpu_count() or 1) as pool:
+        results = list(pool.map(task, paths))
+    print(format_results(results))
+
+    if any(result["status"] in ("fail", "missing", "error") for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
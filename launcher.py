@@ -5,6 +5,10 @@ import importlib.util
 import threading
 import subprocess
 
+from pacing import FrameClock
+from registry import EntryRegistry
+from thumbnails import THUMB_HEIGHT, THUMB_WIDTH, ThumbnailBlock
+
 # -----------------------------------------------------------------------------
 # Constants
 # -----------------------------------------------------------------------------
@@ -14,6 +18,20 @@ BUTTON_HEIGHT = 80            # Height of the button panel
 BUTTON_MARGIN = 10            # Margin between buttons
 BUTTON_PADDING = 15           # Padding inside buttons
 FONT_SIZE = 24                # Font size for button text
+SMALL_FONT_SIZE = 18          # Font size for entry details
+
+GRID_COLUMNS = 4              # Entry buttons per row
+GRID_ROWS = 5                 # Entry button rows per page
+GRID_TOP = 140                # Top of the entry grid
+GRID_BUTTON_HEIGHT = 56       # Height of an entry button
+NAV_BUTTON_WIDTH = 120        # Width of the page navigation buttons
+DASHBOARD_ROWS = 2            # Thumbnail rows per dashboard page
+LABEL_HEIGHT = 22             # Height of the label under a thumbnail
+PACING_MODE = "sleep"         # Leave the CPU to the running games rather than spin
+
+# Entries are started through the instrumentation shim in pass-through mode,
+# which only publishes their live thumbnails
+SHIM_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shim.py")
 
 # Colors
 BACKGROUND_COLOR = (30, 30, 30)
@@ -24,32 +42,52 @@ TITLE_COLOR = (200, 200, 200)
 BACK_BUTTON_COLOR = (150, 50, 50)
 BACK_BUTTON_HOVER_COLOR = (200, 70, 70)
 
-# Game files to launch
-GAME_FILES = [
-    {"name": "GPT o1", "file": "o1.py"},
-    {"name": "Sonnet 3.5", "file": "sonnet-35.py"},
-    {"name": "Sonnet 3.7", "file": "sonnet-37.py"},
-    {"name": "Sonnet 3.7t", "file": "sonnet-37-thinking.py"}
-]
+GAME_FILES_PER_PAGE = GRID_COLUMNS * GRID_ROWS
+THUMBNAILS_PER_PAGE = GRID_COLUMNS * DASHBOARD_ROWS
+
+def format_benchmark(result):
+    """Short summary of a cached benchmark result for an entry button"""
+    if not result:
+        return None
+    # Failed or one-frame runs are cached with fps None
+    if result.get("fps"):
+        return f"{result['fps']:.0f} fps"
+    return result.get("status")
 
 class Button:
-    def __init__(self, x, y, width, height, text, action, color=BUTTON_COLOR, hover_color=BUTTON_HOVER_COLOR):
+    def __init__(self, x, y, width, height, text, action, color=BUTTON_COLOR, hover_color=BUTTON_HOVER_COLOR,
+                 subtext=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
+        self.subtext = subtext
         self.action = action
         self.hovered = False
         self.color = color
         self.hover_color = hover_color
+        self._text_surfs = None
     
-    def draw(self, surface, font):
+    def draw(self, surface, font, small_font=None):
         # Draw button background
         color = self.hover_color if self.hovered else self.color
         pygame.draw.rect(surface, color, self.rect, border_radius=5)
         
-        # Draw button text
-        text_surf = font.render(self.text, True, BUTTON_TEXT_COLOR)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        surface.blit(text_surf, text_rect)
+        # Render the text once; it never changes for a button
+        if self._text_surfs is None:
+            self._text_surfs = [font.render(self.text, True, BUTTON_TEXT_COLOR)]
+            if self.subtext and small_font:
+                self._text_surfs.append(small_font.render(self.subtext, True, TITLE_COLOR))
+        
+        # Draw button text, centred as a block
+        total_height = sum(text_surf.get_height() for text_surf in self._text_surfs)
+        y = self.rect.centery - total_height // 2
+        for text_surf in self._text_surfs:
+            text_rect = text_surf.get_rect(midtop=(self.rect.centerx, y))
+            surface.blit(text_surf, text_rect)
+            y += text_surf.get_height()
+    
+    def set_text(self, text):
+        self.text = text
+        self._text_surfs = None
     
     def update(self, mouse_pos):
         self.hovered = self.rect.collidepoint(mouse_pos)
@@ -65,62 +103,161 @@ class GameLauncher:
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("PyGame Launcher")
-        self.clock = pygame.time.Clock()
+        self.clock = FrameClock(mode=PACING_MODE)
         
         # Create fonts
         self.button_font = pygame.font.SysFont(None, FONT_SIZE)
         self.title_font = pygame.font.SysFont(None, FONT_SIZE * 2)
         
+        self.small_font = pygame.font.SysFont(None, SMALL_FONT_SIZE)
+        
+        # Discover entries; unchanged scripts come straight from the cache
+        self.registry = EntryRegistry()
+        self.games = self.registry.scan()
+        self.page_count = max(1, -(-len(self.games) // GAME_FILES_PER_PAGE))
+        self.page = 0
+        
         # Calculate button dimensions
         button_area_width = WIDTH - (2 * BUTTON_MARGIN)
-        self.button_width = (button_area_width - (len(GAME_FILES) - 1) * BUTTON_MARGIN) // len(GAME_FILES)
+        self.button_width = (button_area_width - (GRID_COLUMNS - 1) * BUTTON_MARGIN) // GRID_COLUMNS
         
-        # Create buttons
+        # Page navigation buttons
+        nav_y = HEIGHT - BUTTON_HEIGHT + BUTTON_MARGIN
+        nav_height = BUTTON_HEIGHT - (2 * BUTTON_MARGIN)
+        self.nav_buttons = [
+            Button(BUTTON_MARGIN, nav_y, NAV_BUTTON_WIDTH, nav_height,
+                   "< Prev", lambda: self.change_page(-1)),
+            Button(WIDTH - BUTTON_MARGIN - NAV_BUTTON_WIDTH, nav_y, NAV_BUTTON_WIDTH, nav_height,
+                   "Next >", lambda: self.change_page(1)),
+            Button(2 * BUTTON_MARGIN + NAV_BUTTON_WIDTH, nav_y, NAV_BUTTON_WIDTH, nav_height,
+                   "Running", self.toggle_dashboard),
+        ]
+        
+        # Only the buttons of the visible page exist at any time
         self.buttons = []
-        for i, game in enumerate(GAME_FILES):
-            x = BUTTON_MARGIN + i * (self.button_width + BUTTON_MARGIN)
-            y = HEIGHT - BUTTON_HEIGHT + BUTTON_MARGIN
-            button = Button(
-                x, y, 
-                self.button_width, BUTTON_HEIGHT - (2 * BUTTON_MARGIN),
-                game["name"],
-                lambda g=game: self.launch_game(g)
-            )
-            self.buttons.append(button)
+        self.create_page_buttons()
         
         # State variables
         self.running = True
-        self.current_process = None
+        self.processes = []           # Running entries, with their thumbnail blocks
+        self.show_dashboard = False
+        self.dashboard_page = 0
         
+    def create_page_buttons(self):
+        """Create the entry buttons for the current page"""
+        first = self.page * GAME_FILES_PER_PAGE
+        self.buttons = []
+        for i, game in enumerate(self.games[first:first + GAME_FILES_PER_PAGE]):
+            row, column = divmod(i, GRID_COLUMNS)
+            x = BUTTON_MARGIN + column * (self.button_width + BUTTON_MARGIN)
+            y = GRID_TOP + row * (GRID_BUTTON_HEIGHT + BUTTON_MARGIN)
+            button = Button(
+                x, y,
+                self.button_width, GRID_BUTTON_HEIGHT,
+                game["name"],
+                lambda g=game: self.launch_game(g),
+                subtext=format_benchmark(game["benchmark"])
+            )
+            self.buttons.append(button)
+    
+    def change_page(self, delta):
+        """Move to another page of entries or of running thumbnails"""
+        if self.show_dashboard:
+            page_count = max(1, -(-len(self.processes) // THUMBNAILS_PER_PAGE))
+            self.dashboard_page = min(max(self.dashboard_page + delta, 0), page_count - 1)
+            return True
+        page = min(max(self.page + delta, 0), self.page_count - 1)
+        if page == self.page:
+            return False
+        self.page = page
+        self.create_page_buttons()
+        self.update_hover(pygame.mouse.get_pos())
+        return True
+    
+    def toggle_dashboard(self):
+        """Switch between the entry grid and live thumbnails of running entries"""
+        self.show_dashboard = not self.show_dashboard
+        self.nav_buttons[2].set_text("Entries" if self.show_dashboard else "Running")
+        return True
+    
+    def update_hover(self, mouse_pos):
+        buttons = self.nav_buttons if self.show_dashboard else self.buttons + self.nav_buttons
+        for button in buttons:
+            button.update(mouse_pos)
+    
     def launch_game(self, game):
         """Launch a game in a separate process"""
+        thumbnail = None
         try:
             # Use the same Python interpreter that's running this script
             python_executable = sys.executable
             
+            # Shared memory the game publishes its thumbnails into
+            env = dict(os.environ, SHIM_PASSTHROUGH="1")
+            try:
+                thumbnail = ThumbnailBlock()
+                env["SHIM_THUMBNAIL"] = thumbnail.name
+            except OSError as e:
+                print(f"Live thumbnail unavailable for {game['file']}: {e}")
+            
             # Start the game in a new process
-            self.current_process = subprocess.Popen([python_executable, game["file"]])
+            process = subprocess.Popen([python_executable, SHIM_FILE, game["path"]],
+                                       cwd=os.path.dirname(game["path"]), env=env)
+            record = {"game": game, "process": process, "thumbnail": thumbnail,
+                      "finished": False, "label": None}
+            self.processes.append(record)
             
             # Start a thread to monitor the process
-            monitor_thread = threading.Thread(target=self.monitor_game_process)
+            monitor_thread = threading.Thread(target=self.monitor_game_process, args=(record,))
             monitor_thread.daemon = True  # Thread will exit when main program exits
             monitor_thread.start()
             
             return True
         except Exception as e:
             print(f"Error launching {game['file']}: {e}")
-            self.current_process = None
+            if thumbnail:
+                thumbnail.close()
             return False
     
-    def monitor_game_process(self):
+    def monitor_game_process(self, record):
         """Monitor the game process and handle its completion"""
-        if self.current_process:
-            # Wait for the process to complete
-            self.current_process.wait()
-            # Reset current process
-            self.current_process = None
-            # Bring launcher window to front
-            pygame.display.set_caption("PyGame Launcher")  # Refresh caption to help with focus
+        # Wait for the process to complete
+        returncode = record["process"].wait()
+        if returncode:
+            print(f"{record['game']['file']} exited with code {returncode}")
+        # The main thread releases its thumbnail block
+        record["finished"] = True
+        # Bring launcher window to front
+        pygame.display.set_caption("PyGame Launcher")  # Refresh caption to help with focus
+    
+    def reap_finished(self):
+        """Forget finished games and free their shared memory"""
+        for record in [record for record in self.processes if record["finished"]]:
+            if record["thumbnail"]:
+                record["thumbnail"].close()
+            self.processes.remove(record)
+    
+    def draw_dashboard(self):
+        """Draw live thumbnails of the running games"""
+        first = self.dashboard_page * THUMBNAILS_PER_PAGE
+        for i, record in enumerate(self.processes[first:first + THUMBNAILS_PER_PAGE]):
+            row, column = divmod(i, GRID_COLUMNS)
+            cell_x = BUTTON_MARGIN + column * (self.button_width + BUTTON_MARGIN)
+            cell_y = GRID_TOP + row * (THUMB_HEIGHT + LABEL_HEIGHT + BUTTON_MARGIN)
+            thumb_rect = pygame.Rect(cell_x + (self.button_width - THUMB_WIDTH) // 2, cell_y,
+                                     THUMB_WIDTH, THUMB_HEIGHT)
+            
+            surface = record["thumbnail"].read() if record["thumbnail"] else None
+            if surface:
+                self.screen.blit(surface, thumb_rect)
+            else:
+                pygame.draw.rect(self.screen, BUTTON_COLOR, thumb_rect)
+            pygame.draw.rect(self.screen, BUTTON_HOVER_COLOR, thumb_rect, 1)
+            
+            if record["label"] is None:
+                record["label"] = self.small_font.render(record["game"]["name"], True, TITLE_COLOR)
+            label_rect = record["label"].get_rect(midtop=(thumb_rect.centerx, thumb_rect.bottom + 4))
+            self.screen.blit(record["label"], label_rect)
     
     def draw(self):
         """Draw the launcher interface"""
@@ -128,21 +265,41 @@ class GameLauncher:
         
         # Draw title
         title_surf = self.title_font.render("PyGame Launcher", True, TITLE_COLOR)
-        title_rect = title_surf.get_rect(center=(WIDTH // 2, HEIGHT // 3))
+        title_rect = title_surf.get_rect(center=(WIDTH // 2, 50))
         self.screen.blit(title_surf, title_rect)
         
         # Draw instructions
-        instructions = self.button_font.render("Click a button below to launch a game", True, TITLE_COLOR)
-        instructions_rect = instructions.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+        if self.show_dashboard:
+            text = "Live view of running games" if self.processes else "No games running"
+        elif self.games:
+            text = "Click a button below to launch a game"
+        else:
+            text = "No entries found"
+        instructions = self.button_font.render(text, True, TITLE_COLOR)
+        instructions_rect = instructions.get_rect(center=(WIDTH // 2, 100))
         self.screen.blit(instructions, instructions_rect)
         
         # Draw button panel background
         pygame.draw.rect(self.screen, (50, 50, 50), 
                          pygame.Rect(0, HEIGHT - BUTTON_HEIGHT, WIDTH, BUTTON_HEIGHT))
         
-        # Draw buttons
-        for button in self.buttons:
+        # Draw page indicator and navigation
+        if self.show_dashboard:
+            page_text = f"Page {self.dashboard_page + 1}  ({len(self.processes)} running)"
+        else:
+            page_text = f"Page {self.page + 1} / {self.page_count}  ({len(self.games)} entries)"
+        page_surf = self.button_font.render(page_text, True, TITLE_COLOR)
+        page_rect = page_surf.get_rect(center=(WIDTH // 2, HEIGHT - BUTTON_HEIGHT // 2))
+        self.screen.blit(page_surf, page_rect)
+        for button in self.nav_buttons:
             button.draw(self.screen, self.button_font)
+        
+        # Draw buttons, or thumbnails of the running games
+        if self.show_dashboard:
+            self.draw_dashboard()
+        else:
+            for button in self.buttons:
+                button.draw(self.screen, self.button_font, self.small_font)
     
     def run(self):
         """Main loop for the launcher"""
@@ -154,15 +311,32 @@ class GameLauncher:
                 if event.type == pygame.QUIT:
                     self.running = False
                 
+                # Page through entries with the mouse wheel or keyboard
+                elif event.type == pygame.MOUSEWHEEL:
+                    self.change_page(-event.y)
+                elif event.type == pygame.KEYDOWN:
+                    if event.key in (pygame.K_LEFT, pygame.K_PAGEUP):
+                        self.change_page(-1)
+                    elif event.key in (pygame.K_RIGHT, pygame.K_PAGEDOWN):
+                        self.change_page(1)
+                    elif event.key == pygame.K_TAB:
+                        self.toggle_dashboard()
+                
                 # Handle button clicks
-                for button in self.buttons:
+                for button in self.nav_buttons:
                     if button.handle_event(event):
-                        # Game launched successfully, continue running launcher
-                        pass
+                        break
+                else:
+                    if self.show_dashboard:
+                        continue
+                    for button in self.buttons:
+                        if button.handle_event(event):
+                            # Game launched successfully, continue running launcher
+                            pass
             
             # Update button states
-            for button in self.buttons:
-                button.update(mouse_pos)
+            self.update_hover(mouse_pos)
+            self.reap_finished()
             
             # Draw the launcher interface
             self.draw()
@@ -170,7 +344,10 @@ class GameLauncher:
             pygame.display.flip()
             self.clock.tick(FPS)
         
-        # Clean up
+        # Clean up; games still running keep their mapping of the shared memory
+        for record in self.processes:
+            if record["thumbnail"]:
+                record["thumbnail"].close()
         pygame.quit()
 
 def main():
@@ -1,6 +1,8 @@
 import pygame
 import math
 
+from pacing import FrameClock
+
 # -----------------------------------------------------------------------------
 # Constants
 # -----------------------------------------------------------------------------
@@ -126,7 +128,7 @@ def main():
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Bouncing Ball in Spinning Hexagon")
-    clock = pygame.time.Clock()
+    clock = FrameClock()
 
     # Ball properties
     ball_x, ball_y = WIDTH // 2, HEIGHT // 2 - 50   # Moved ball inside
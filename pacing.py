@@ -0,0 +1,358 @@
+"""
+Frame pacing for the entries and the launcher.
+
+FrameClock is a drop-in replacement for pygame.time.Clock.  pygame's
+tick() sleeps for whole milliseconds measured from the previous tick, so
+scheduler wake-up latency and rounding add up to jitter and drift.
+FrameClock keeps absolute deadlines on a fixed grid instead, sleeps until
+shortly before each one and spins for the rest, and records how well it
+kept to them.
+
+Settings come from environment variables so unmodified call sites can be
+tuned per run:
+
+    PACING_MODE          sleep, balanced (default), precise or spin
+    PACING_SPIN_MS       Milliseconds spun before each deadline (overrides the mode)
+    PACING_REFRESH_RATE  Display refresh rate to align frames to, in Hz
+    PACING_REPORT        "1" to print a pacing report when the program exits
+
+Usage: python pacing.py [--frames N] [--fps N] [--load MS]
+"""
+import argparse
+import atexit
+import collections
+import math
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pygame
+
+from analytics import RunningStats, StreamingHistogram
+
+# -----------------------------------------------------------------------------
+# Constants
+# -----------------------------------------------------------------------------
+PACING_MODES = {                # Seconds spun before each deadline
+    "sleep": 0.0,               # Lowest CPU use, at the mercy of the scheduler
+    "balanced": 0.002,
+    "precise": 0.005,
+    "spin": math.inf,           # Busy-waits the whole frame
+}
+DEFAULT_MODE = "balanced"
+MISS_TOLERANCE = 0.001          # Seconds past a deadline that count as a miss
+OVERSLEEP_WEIGHT = 0.1          # Smoothing of the measured sleep overshoot
+MAX_OVERSLEEP = 0.004           # Cap on the overshoot allowed for when sleeping
+FPS_WINDOW = 10                 # Ticks averaged by get_fps(), as in pygame
+HISTORY_CHUNK = 256             # Frames buffered before the statistics update
+LATENESS_BINS = 40              # Histogram bins for lateness past the deadline
+LATENESS_RANGE = (0.0, 0.010)   # Lateness histogram range (seconds)
+
+
+def _env_float(name, default):
+    """Float setting from the environment; a bad value warns and is ignored"""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        warnings.warn(f"{name}={value!r} is not a number; ignoring it")
+        return default
+
+
+def _env_mode():
+    """PACING_MODE; every game builds a FrameClock, so a typo warns rather than crashes"""
+    mode = os.environ.get("PACING_MODE", DEFAULT_MODE)
+    if mode not in PACING_MODES:
+        warnings.warn(f"PACING_MODE={mode!r} is not one of {', '.join(PACING_MODES)};"
+                      f" using {DEFAULT_MODE!r}")
+        return DEFAULT_MODE
+    return mode
+
+
+MODE = _env_mode()
+SPIN_MS = _env_float("PACING_SPIN_MS", None)
+REFRESH_RATE = _env_float("PACING_REFRESH_RATE", 0.0)
+REPORT = os.environ.get("PACING_REPORT", "0") == "1"
+
+
+def display_refresh_rate():
+    """Refresh rate of the first display in Hz, or 0 if pygame can't tell"""
+    get_rates = getattr(pygame.display, "get_desktop_refresh_rates", None)
+    if get_rates is None or not pygame.display.get_init():
+        return 0.0
+    try:
+        rates = get_rates()
+    except pygame.error:
+        return 0.0
+    return float(rates[0]) if rates else 0.0
+
+
+class FrameClock:
+    """
+    Deadline-based replacement for pygame.time.Clock.
+
+    tick(framerate) waits until the next deadline, one frame period after
+    the previous one.  The wait sleeps until spin_margin seconds (plus the
+    sleep overshoot measured so far) before the deadline and spins from
+    there, so a larger margin buys precision with CPU time.  A frame that
+    overruns its deadline counts as missed; if it overran by whole periods,
+    the schedule skips ahead rather than rushing frames to catch up.
+
+    With a refresh rate (given, from PACING_REFRESH_RATE, or detected when
+    vsync=True), the period is rounded to a whole number of refresh
+    intervals so frames don't beat against the display.
+    """
+
+    def __init__(self, mode=None, spin_margin=None, refresh_rate=None, vsync=False, report=REPORT):
+        mode = mode or MODE
+        if mode not in PACING_MODES:
+            raise ValueError(f"unknown pacing mode {mode!r}; expected one of {', '.join(PACING_MODES)}")
+        if spin_margin is None:
+            spin_margin = SPIN_MS / 1000 if SPIN_MS is not None else PACING_MODES[mode]
+        if refresh_rate is None:
+            refresh_rate = REFRESH_RATE or (display_refresh_rate() if vsync else 0.0)
+        self.mode = mode
+        self.spin_margin = spin_margin
+        self.refresh_rate = refresh_rate
+
+        self._framerate = None
+        self._period = 0.0
+        self._deadline = None
+        self._last_tick = None
+        self._first_tick = None
+        self._oversleep = 0.0
+        self._time = 0
+        self._rawtime = 0
+        self._intervals = collections.deque(maxlen=FPS_WINDOW)
+
+        # Pacing record
+        self.frames = 0
+        self.missed = 0
+        self.dropped = 0
+        self.sleep_time = 0.0
+        self.spin_time = 0.0
+        self.interval = RunningStats()
+        self.lateness = RunningStats()
+        self.lateness_histogram = StreamingHistogram(LATENESS_BINS, LATENESS_RANGE)
+        self._history = np.empty((HISTORY_CHUNK, 2))
+        self._buffered = 0
+
+        if report:
+            atexit.register(lambda: print(self.report(), file=sys.stderr))
+
+    # -------------------------------------------------------------------------
+    # pygame.time.Clock interface
+    # -------------------------------------------------------------------------
+    def tick(self, framerate=0):
+        """Wait for the next frame deadline; returns milliseconds since the last tick"""
+        return self._tick(framerate, self.spin_margin)
+
+    def tick_busy_loop(self, framerate=0):
+        """Like tick() but spins for the whole wait"""
+        return self._tick(framerate, math.inf)
+
+    def get_time(self):
+        return self._time
+
+    def get_rawtime(self):
+        return self._rawtime
+
+    def get_fps(self):
+        if not self._intervals:
+            return 0.0
+        total = sum(self._intervals)
+        return len(self._intervals) / total if total else 0.0
+
+    # -------------------------------------------------------------------------
+    # Waiting
+    # -------------------------------------------------------------------------
+    def frame_period(self, framerate):
+        """Seconds per frame at framerate, rounded to the refresh rate if one is set"""
+        if self.refresh_rate:
+            return max(1, round(self.refresh_rate / framerate)) / self.refresh_rate
+        return 1.0 / framerate
+
+    def _tick(self, framerate, spin_margin):
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            self._rawtime = int((now - self._last_tick) * 1000)
+
+        if framerate and framerate > 0:
+            if framerate != self._framerate:
+                self._framerate = framerate
+                self._period = self.frame_period(framerate)
+                self._deadline = None
+            if self._deadline is None:
+                self._deadline = now + self._period
+            now = self._wait(self._deadline, spin_margin)
+            lateness = now - self._deadline
+            if lateness > MISS_TOLERANCE:
+                self.missed += 1
+            self._record(now, lateness)
+            if lateness >= self._period:
+                skipped = int(lateness // self._period)
+                self.dropped += skipped
+                self._deadline += skipped * self._period
+            self._deadline += self._period
+        else:
+            self._framerate = None
+            self._deadline = None
+            self._record(now, None)
+        return self._time
+
+    def _wait(self, deadline, spin_margin):
+        """Sleep then spin until deadline; returns the time on waking"""
+        now = time.perf_counter()
+        # Without spinning, sleeping short of the deadline would just wake early
+        early = spin_margin + self._oversleep if spin_margin else 0.0
+        sleep = deadline - now - early
+        if sleep > 0:
+            time.sleep(sleep)
+            woke = time.perf_counter()
+            overshoot = woke - now - sleep
+            self._oversleep = min(MAX_OVERSLEEP, self._oversleep
+                                  + OVERSLEEP_WEIGHT * (overshoot - self._oversleep))
+            self.sleep_time += woke - now
+            now = woke
+        if spin_margin and now < deadline:
+            start = now
+            while now < deadline:
+                now = time.perf_counter()
+            self.spin_time += now - start
+        return now
+
+    # -------------------------------------------------------------------------
+    # Statistics
+    # -------------------------------------------------------------------------
+    def _record(self, now, lateness):
+        if self._last_tick is None:
+            self._first_tick = now
+        else:
+            interval = now - self._last_tick
+            self._time = int(interval * 1000)
+            self._intervals.append(interval)
+            self._history[self._buffered] = (interval, math.nan if lateness is None else lateness)
+            self._buffered += 1
+            if self._buffered == HISTORY_CHUNK:
+                self.flush()
+        self._last_tick = now
+        self.frames += 1
+
+    def flush(self):
+        """Fold buffered frames into the statistics"""
+        if self._buffered:
+            history = self._history[:self._buffered]
+            self._buffered = 0
+            self.interval.update_chunk(history[:, 0])
+            lateness = history[:, 1][~np.isnan(history[:, 1])]
+            self.lateness.update_chunk(lateness)
+            self.lateness_histogram.update_chunk(lateness)
+
+    def summary(self):
+        """Pacing record so far as plain Python values"""
+        self.flush()
+        elapsed = (self._last_tick - self._first_tick) if self.frames > 1 else 0.0
+        return {
+            "mode": self.mode,
+            "spin_margin": self.spin_margin,
+            "refresh_rate": self.refresh_rate,
+            "target_fps": 1.0 / self._period if self._period else None,
+            "frames": self.frames,
+            "effective_fps": (self.frames - 1) / elapsed if elapsed else None,
+            "missed": self.missed,
+            "dropped": self.dropped,
+            "sleep_time": self.sleep_time,
+            "spin_time": self.spin_time,
+            "spin_fraction": self.spin_time / elapsed if elapsed else 0.0,
+            "interval": self.interval.as_dict(),
+            "lateness": self.lateness.as_dict(),
+            "lateness_histogram": self.lateness_histogram.as_dict(),
+        }
+
+    def report(self):
+        """Human-readable pacing report with a text histogram of lateness"""
+        summary = self.summary()
+        target = f"{summary['target_fps']:.2f}" if summary["target_fps"] else "uncapped"
+        effective = f"{summary['effective_fps']:.2f}" if summary["effective_fps"] else "-"
+        lines = [
+            f"Pacing: {summary['frames']} frames  target fps {target}  effective fps {effective}",
+            f"mode {summary['mode']}  spin margin {summary['spin_margin'] * 1000:g} ms"
+            f"  spinning {summary['spin_fraction']:.1%} of the time",
+            f"missed deadlines {summary['missed']}  dropped frames {summary['dropped']}",
+        ]
+        for key in ("interval", "lateness"):
+            stats = summary[key]
+            if stats["count"]:
+                lines.append(f"{key + ' ms':<12} mean {stats['mean'] * 1000:>8.3f}  std {stats['std'] * 1000:>8.3f}"
+                             f"  min {stats['min'] * 1000:>8.3f}  max {stats['max'] * 1000:>8.3f}")
+
+        histogram = summary["lateness_histogram"]
+        total = sum(histogram["counts"]) + histogram["overflow"]
+        if total:
+            lines.append("lateness histogram:")
+            edges = histogram["edges"]
+            rows = [(f"{edges[i] * 1000:5.2f}-{edges[i + 1] * 1000:5.2f} ms", count)
+                    for i, count in enumerate(histogram["counts"]) if count]
+            if histogram["overflow"]:
+                rows.append((f">= {edges[-1] * 1000:.2f} ms".rjust(14), histogram["overflow"]))
+            for label, count in rows:
+                bar = "#" * max(1, round(40 * count / total))
+                lines.append(f"  {label}  {count:>7}  {bar}")
+        return "\n".join(lines)
+
+
+def benchmark(clock_factory, frames, framerate, load):
+    """
+    Tick a clock for frames frames with load seconds of busy work per frame.
+    Frames are timed outside the clock, so every clock is measured the same way.
+    """
+    clock = clock_factory()
+    period = 1.0 / framerate
+    stamps = np.empty(frames + 1)
+    stamps[0] = time.perf_counter()
+    start = time.process_time()
+    for frame in range(1, frames + 1):
+        end = time.perf_counter() + load
+        while time.perf_counter() < end:
+            pass
+        clock.tick(framerate)
+        stamps[frame] = time.perf_counter()
+    cpu = time.process_time() - start
+
+    intervals = np.diff(stamps[1:])
+    # Frame n is due n periods after the first one
+    lateness = stamps[1:] - stamps[1] - period * np.arange(frames)
+    return {
+        "effective_fps": (frames - 1) / (stamps[-1] - stamps[1]),
+        "interval_std": intervals.std(),
+        "interval_max": intervals.max(),
+        "late": int(np.count_nonzero(np.diff(lateness) > MISS_TOLERANCE)),
+        "drift": lateness[-1],
+        "cpu": cpu,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare frame pacing of pygame's Clock and FrameClock.")
+    parser.add_argument("--frames", type=int, default=300, help="frames per clock")
+    parser.add_argument("--fps", type=float, default=60, help="target framerate")
+    parser.add_argument("--load", type=float, default=5.0, help="milliseconds of busy work per frame")
+    args = parser.parse_args()
+
+    clocks = [("Clock.tick (pygame)", pygame.time.Clock)]
+    clocks += [(f"FrameClock {mode}", lambda mode=mode: FrameClock(mode)) for mode in PACING_MODES]
+    print(f"{args.frames} frames at {args.fps:g} fps with {args.load:g} ms of work per frame")
+    print(f"{'clock':<20} {'fps':>8} {'std ms':>8} {'max ms':>8} {'late':>6} {'drift ms':>9} {'cpu s':>7}")
+    for name, factory in clocks:
+        result = benchmark(factory, args.frames, args.fps, args.load / 1000)
+        print(f"{name:<20} {result['effective_fps']:>8.2f} {result['interval_std'] * 1000:>8.3f}"
+              f" {result['interval_max'] * 1000:>8.3f} {result['late']:>6} {result['drift'] * 1000:>9.2f}"
+              f" {result['cpu']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+class DoubleBuffer:
+    """Two preallocated copies of a simulation state shared between threads.
+
+    The writer fills the back buffer without holding any lock and then calls
+    publish(), which only flips the front index.  Readers copy the front
+    buffer out under the same lock, so the writer can never be filling the
+    buffer a reader is copying.  With a state of a few floats both critical
+    sections are a handful of instructions.
+    """
+
+    def __init__(self, template):
+        self._buffers = [np.array(template, dtype=float), np.array(template, dtype=float)]
+        self._front = 0
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def back(self):
+        """Buffer the writer may fill; only the writer thread should touch it"""
+        return self._buffers[1 - self._front]
+
+    def publish(self):
+        """Make the back buffer the new front"""
+        with self._lock:
+            self._front ^= 1
+            self._version += 1
+
+    def read(self, out):
+        """Copy the latest published state into out and return its version"""
+        with self._lock:
+            np.copyto(out, self._buffers[self._front])
+            return self._version
+
+
+class PhysicsThread(threading.Thread):
+    """Runs a simulation step function on a worker thread.
+
+    step() advances the simulation and snapshot(buffer) writes its state into
+    the given array; after every step the snapshot is published through a
+    DoubleBuffer for the render thread.  Anything that mutates the simulation
+    from another thread must go through submit() so it runs between steps.
+    """
+
+    def __init__(self, step, snapshot, buffer, rate=60):
+        super().__init__(daemon=True)
+        self.step = step
+        self.snapshot = snapshot
+        self.buffer = buffer
+        self.rate = rate            # Steps per second, 0 for as fast as possible
+        self.steps = 0
+        self.elapsed = 0.0
+        self._commands = queue.SimpleQueue()
+        self._stop_event = threading.Event()
+
+    def submit(self, command):
+        """Queue a callable to run on the physics thread before the next step"""
+        self._commands.put(command)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def run(self):
+        period = 1.0 / self.rate if self.rate else 0.0
+        start = time.perf_counter()
+        deadline = start
+        while not self._stop_event.is_set():
+            while True:
+                try:
+                    command = self._commands.get_nowait()
+                except queue.Empty:
+                    break
+                command()
+
+            self.step()
+            self.snapshot(self.buffer.back)
+            self.buffer.publish()
+            self.steps += 1
+
+            if period:
+                deadline += period
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind; don't try to catch up with a burst of steps
+                    deadline = time.perf_counter()
+        self.elapsed = time.perf_counter() - start
+
+    @property
+    def steps_per_second(self):
+        return self.steps / self.elapsed if self.elapsed else 0.0
@@ -0,0 +1,164 @@
+import json
+import os
+import re
+
+# -----------------------------------------------------------------------------
+# Constants
+# -----------------------------------------------------------------------------
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+ENTRY_DIRS = [".", "submissions"]       # Searched for entry scripts, relative to the root
+CACHE_FILE = ".entry_cache.json"        # Metadata cache, relative to the root
+CACHE_VERSION = 1
+
+# Scripts in the entry directories that are tooling rather than submissions
+EXCLUDED_FILES = {"launcher.py"}
+
+# Display names for entries that predate the "# Model:" header
+KNOWN_NAMES = {
+    "o1.py": "GPT o1",
+    "sonnet-35.py": "Sonnet 3.5",
+    "sonnet-37.py": "Sonnet 3.7",
+    "sonnet-37-thinking.py": "Sonnet 3.7t",
+}
+
+MODEL_HEADER = re.compile(r"^#\s*Model:\s*(.+?)\s*$", re.MULTILINE)
+PYGAME_IMPORT = re.compile(r"^\s*(import pygame|from pygame\b)", re.MULTILINE)
+HEADER_LINES = 20                      # Lines searched for the "# Model:" header
+
+
+def parse_entry(path):
+    """
+    Read a script and decide whether it is a benchmark entry.
+    Returns its display name, or None if it is not an entry.
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        source = f.read()
+    if not PYGAME_IMPORT.search(source) or "set_mode" not in source:
+        return None
+
+    header = "\n".join(source.splitlines()[:HEADER_LINES])
+    match = MODEL_HEADER.search(header)
+    if match:
+        return match.group(1)
+    filename = os.path.basename(path)
+    if filename in KNOWN_NAMES:
+        return KNOWN_NAMES[filename]
+    return os.path.splitext(filename)[0].replace("-", " ").replace("_", " ").title()
+
+
+class EntryRegistry:
+    """
+    Discovers entry scripts and caches their metadata.
+
+    Each cached record is keyed by the script's path and remembers the
+    mtime and size it was parsed at, so a script is only re-read when it
+    changes.  Records also hold the script's last benchmark result, which
+    is dropped when the script changes.
+    """
+
+    def __init__(self, root=ROOT_DIR, cache_file=CACHE_FILE):
+        self.root = root
+        self.cache_path = os.path.join(root, cache_file)
+        self.records = {}
+        self._dirty = False
+        self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.records = data.get("entries", {})
+
+    def save(self):
+        """Write the cache back to disk if anything changed"""
+        if not self._dirty:
+            return
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": self.records}, f, indent=1)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Error saving entry cache: {e}")
+
+    def _candidates(self):
+        """Yield (relative path, stat result) for every .py file in ENTRY_DIRS"""
+        for directory in ENTRY_DIRS:
+            full_dir = os.path.join(self.root, directory)
+            try:
+                scanned = os.scandir(full_dir)
+            except OSError:
+                continue
+            with scanned:
+                for dir_entry in scanned:
+                    if not dir_entry.name.endswith(".py") or dir_entry.name in EXCLUDED_FILES:
+                        continue
+                    if not dir_entry.is_file():
+                        continue
+                    yield os.path.normpath(os.path.join(directory, dir_entry.name)), dir_entry.stat()
+
+    def scan(self):
+        """
+        Return all entries sorted by name.  Only new or modified scripts are
+        parsed; everything else comes from the cache.
+        """
+        entries = []
+        seen = set()
+        for rel_path, stat in self._candidates():
+            seen.add(rel_path)
+            record = self.records.get(rel_path)
+            if record is None or record["mtime"] != stat.st_mtime_ns or record["size"] != stat.st_size:
+                try:
+                    name = parse_entry(os.path.join(self.root, rel_path))
+                except OSError as e:
+                    print(f"Error reading {rel_path}: {e}")
+                    continue
+                record = {
+                    "mtime": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "name": name,
+                    "benchmark": None,
+                }
+                self.records[rel_path] = record
+                self._dirty = True
+            if record["name"] is not None:
+                entries.append(self._entry(rel_path, record))
+
+        for rel_path in set(self.records) - seen:
+            del self.records[rel_path]
+            self._dirty = True
+
+        self.save()
+        entries.sort(key=lambda entry: entry["name"].lower())
+        return entries
+
+    def _entry(self, rel_path, record):
+        return {
+            "name": record["name"],
+            "file": rel_path,
+            "path": os.path.join(self.root, rel_path),
+            "size": record["size"],
+            "benchmark": record["benchmark"],
+        }
+
+    def record_benchmark(self, rel_path, result, save=True):
+        """
+        Store the latest benchmark result for an entry and save the cache.
+        Pass save=False when recording many results, then call save() once.
+        """
+        record = self.records.get(os.path.normpath(rel_path))
+        if record is None:
+            return
+        record["benchmark"] = result
+        self._dirty = True
+        if save:
+            self.save()
+
+
+def discover_entries(root=ROOT_DIR):
+    """Convenience wrapper returning the current entry list"""
+    return EntryRegistry(root).scan()
@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from registry import EntryRegistry
+
+# -----------------------------------------------------------------------------
+# Constants
+# -----------------------------------------------------------------------------
+SHIM_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shim.py")
+DEFAULT_FRAMES = 600          # Frames each entry runs before being stopped
+DEFAULT_TIMEOUT = 60          # Seconds before an entry is killed
+DEFAULT_MEMORY_MB = 2048      # Address-space limit per entry
+STDERR_TAIL = 2000            # Characters of stderr kept for failed runs
+
+
+def run_submission(path, frames=DEFAULT_FRAMES, timeout=DEFAULT_TIMEOUT,
+                   memory_mb=DEFAULT_MEMORY_MB, uncapped=True, extra_env=None):
+    """
+    Run one entry script headlessly under the instrumentation shim.
+    Always returns a result dict; failures are reported in its "status".
+    """
+    path = os.path.abspath(path)
+    fd, result_path = tempfile.mkstemp(prefix="shim-", suffix=".json")
+    os.close(fd)
+    env = dict(os.environ)
+    env.update({
+        "SDL_VIDEODRIVER": "dummy",
+        "SDL_AUDIODRIVER": "dummy",
+        "PYGAME_HIDE_SUPPORT_PROMPT": "1",
+        # One BLAS thread per child, or the memory limit is spent on thread stacks
+        "OPENBLAS_NUM_THREADS": "1",
+        "OMP_NUM_THREADS": "1",
+        "SHIM_FRAMES": str(frames),
+        "SHIM_UNCAPPED": "1" if uncapped else "0",
+        "SHIM_RESULT": result_path,
+        # Applied by the shim itself: a preexec_fn isn't safe from worker threads
+        "SHIM_MEMORY_MB": str(memory_mb or 0),
+    })
+    # Benchmarks and golden frames need repeatable runs
+    env.setdefault("SHIM_SEED", "0")
+    if extra_env:
+        env.update(extra_env)
+
+    try:
+        try:
+            completed = subprocess.run(
+                [sys.executable, SHIM_FILE, path],
+                cwd=os.path.dirname(path),
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return {"file": path, "status": "timeout", "timeout": timeout}
+
+        try:
+            with open(result_path, encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            stderr = completed.stderr.decode("utf-8", errors="replace")
+            return {"file": path, "status": "crashed", "returncode": completed.returncode,
+                    "error": stderr[-STDERR_TAIL:]}
+    finally:
+        os.remove(result_path)
+
+    result["file"] = path
+    return result
+
+
+def run_batch(paths, workers=None, **kwargs):
+    """Run many entries across a pool of workers, returning results in order"""
+    # Each worker just waits on a child process, so threads are enough
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        return list(pool.map(lambda path: run_submission(path, **kwargs), paths))
+
+
+def format_results(results):
+    lines = [f"{'entry':<32} {'status':<8} {'frames':>7} {'fps':>9} {'p95 ms':>8} {'max ms':>8}"]
+    for result in results:
+        name = os.path.basename(result["file"])
+        if result.get("fps"):
+            lines.append(f"{name:<32} {result['status']:<8} {result['frames']:>7} {result['fps']:>9.1f}"
+                         f" {result['frame_time_p95'] * 1000:>8.2f} {result['frame_time_max'] * 1000:>8.2f}")
+        else:
+            lines.append(f"{name:<32} {result['status']:<8} {result.get('frames', 0):>7}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entry scripts headlessly.")
+    parser.add_argument("files", nargs="*", help="entry scripts (default: every discovered entry)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames to run each entry for")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds before an entry is killed")
+    parser.add_argument("--memory", type=int, default=DEFAULT_MEMORY_MB, help="memory limit per entry in MB")
+    parser.add_argument("--workers", type=int, default=None, help="entries run in parallel")
+    parser.add_argument("--capped", action="store_true", help="keep the entries' own FPS cap")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--no-record", action="store_true", help="don't store results in the entry cache")
+    args = parser.parse_args()
+
+    registry = EntryRegistry()
+    entries = registry.scan()
+    paths = args.files or [entry["path"] for entry in entries]
+
+    results = run_batch(paths, workers=args.workers, frames=args.frames, timeout=args.timeout,
+                        memory_mb=args.memory, uncapped=not args.capped)
+
+    if not args.no_record:
+        files = {entry["path"]: entry["file"] for entry in entries}
+        for result in results:
+            if result["file"] in files:
+                registry.record_benchmark(files[result["file"]], result, save=False)
+        registry.save()
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+    else:
+        print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Instrumentation shim for running unmodified entry scripts.
+
+Usage: python shim.py ENTRY.py [ARGS...]
+
+Patches pygame before the entry runs, then executes it as __main__.  The
+patches time every displayed frame, optionally lift the entry's FPS cap
+and stop the entry after a fixed number of frames.  Settings come from
+environment variables so the runner can configure them per child:
+
+    SHIM_FRAMES     Stop after this many frames (0 = run until the entry exits)
+    SHIM_UNCAPPED   "1" to ignore the framerate passed to Clock.tick
+    SHIM_SEED       Seed for random and numpy.random (unseeded if unset)
+    SHIM_RESULT     Write a JSON result to this path instead of stdout
+    SHIM_CAPTURE    Comma-separated frame numbers to save as .npy arrays
+    SHIM_CAPTURE_DIR  Directory the captured frames are written to
+    SHIM_THUMBNAIL  Name of a shared-memory block to publish thumbnails into
+    SHIM_MEMORY_MB  Address-space limit applied before the entry starts (POSIX only)
+    SHIM_PASSTHROUGH  "1" to only publish thumbnails: no timing, no result, and
+                    the entry's errors reach stderr with a non-zero exit
+
+Entries using pacing.FrameClock are handled the same way; with the cap
+kept, the result also carries the clock's pacing record.
+"""
+import itertools
+import json
+import os
+import random
+import runpy
+import sys
+import time
+import traceback
+
+import numpy
+import pygame
+
+import pacing
+from thumbnails import ThumbnailWriter
+
+# -----------------------------------------------------------------------------
+# Settings
+# -----------------------------------------------------------------------------
+FRAMES = int(os.environ.get("SHIM_FRAMES", "0"))
+UNCAPPED = os.environ.get("SHIM_UNCAPPED", "0") == "1"
+SEED = os.environ.get("SHIM_SEED")
+RESULT_PATH = os.environ.get("SHIM_RESULT")
+CAPTURE_FRAMES = {int(n) for n in os.environ.get("SHIM_CAPTURE", "").split(",") if n.strip()}
+CAPTURE_DIR = os.environ.get("SHIM_CAPTURE_DIR", ".")
+THUMBNAIL_BLOCK = os.environ.get("SHIM_THUMBNAIL")
+MEMORY_MB = int(os.environ.get("SHIM_MEMORY_MB", "0"))
+PASSTHROUGH = os.environ.get("SHIM_PASSTHROUGH", "0") == "1"
+
+
+class StopRun(BaseException):
+    """Raised from a patched pygame call to end the entry.
+
+    Derives from BaseException so the entry's own `except Exception`
+    handlers don't swallow it.
+    """
+
+
+class Recorder:
+    """Collects timings from the patched pygame calls"""
+
+    def __init__(self):
+        self.frame_times = []
+        self.last_frame = None
+        self.tick_time = 0.0
+        self.event_time = 0.0
+        self.event_count = 0
+        self.frame_hooks = []     # Called with the frame number after each frame
+        self.pacing_clock = None  # Last FrameClock the entry created
+
+    @property
+    def frames(self):
+        return len(self.frame_times) + (self.last_frame is not None)
+
+    def frame(self):
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            self.frame_times.append(now - self.last_frame)
+        self.last_frame = now
+        frame = self.frames
+        for hook in self.frame_hooks:
+            hook(frame)
+        if FRAMES and frame >= FRAMES:
+            raise StopRun()
+
+
+recorder = Recorder()
+
+
+class ShimClock:
+    """Stand-in for pygame.time.Clock that can lift the framerate cap"""
+
+    clock_class = None          # Clock being wrapped, set by install()
+
+    def __init__(self, *args, **kwargs):
+        self._clock = self.clock_class(*args, **kwargs)
+
+    def tick(self, framerate=0):
+        start = time.perf_counter()
+        result = self._clock.tick(0 if UNCAPPED else framerate)
+        recorder.tick_time += time.perf_counter() - start
+        return result
+
+    def tick_busy_loop(self, framerate=0):
+        start = time.perf_counter()
+        result = self._clock.tick_busy_loop(0 if UNCAPPED else framerate)
+        recorder.tick_time += time.perf_counter() - start
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._clock, name)
+
+
+def _wrap_display(function):
+    def wrapper(*args, **kwargs):
+        result = function(*args, **kwargs)
+        recorder.frame()
+        return result
+    return wrapper
+
+
+def _wrap_hooks(function):
+    """Like _wrap_display, but only runs the frame hooks; nothing is timed"""
+    frames = itertools.count(1)
+
+    def wrapper(*args, **kwargs):
+        result = function(*args, **kwargs)
+        frame = next(frames)
+        for hook in recorder.frame_hooks:
+            hook(frame)
+        return result
+    return wrapper
+
+
+def _event_get(*args, **kwargs):
+    start = time.perf_counter()
+    events = _event_get_original(*args, **kwargs)
+    recorder.event_time += time.perf_counter() - start
+    recorder.event_count += len(events)
+    return events
+
+
+def capture_frame(frame):
+    """Frame hook saving the displayed image on the frames in SHIM_CAPTURE"""
+    if frame in CAPTURE_FRAMES:
+        surface = pygame.display.get_surface()
+        if surface is not None:
+            path = os.path.join(CAPTURE_DIR, f"frame_{frame:06d}.npy")
+            numpy.save(path, pygame.surfarray.array3d(surface))
+
+
+def thumbnail_hook(writer):
+    """Frame hook publishing every displayed frame as a thumbnail"""
+    def publish(frame):
+        surface = pygame.display.get_surface()
+        if surface is not None:
+            writer.publish(surface)
+    return publish
+
+
+class ShimPygameClock(ShimClock):
+    clock_class = pygame.time.Clock
+
+
+class ShimFrameClock(ShimClock):
+    clock_class = pacing.FrameClock
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        recorder.pacing_clock = self._clock
+
+
+_event_get_original = pygame.event.get
+
+
+def install():
+    """Patch pygame; must run before the entry imports names from it"""
+    if THUMBNAIL_BLOCK:
+        recorder.frame_hooks.append(thumbnail_hook(ThumbnailWriter(THUMBNAIL_BLOCK)))
+    if PASSTHROUGH:
+        # Frame times would only pile up unread for the life of the game
+        if recorder.frame_hooks:
+            pygame.display.flip = _wrap_hooks(pygame.display.flip)
+            pygame.display.update = _wrap_hooks(pygame.display.update)
+        return
+    pygame.display.flip = _wrap_display(pygame.display.flip)
+    pygame.display.update = _wrap_display(pygame.display.update)
+    pygame.time.Clock = ShimPygameClock
+    pacing.FrameClock = ShimFrameClock
+    pygame.event.get = _event_get
+    if CAPTURE_FRAMES:
+        recorder.frame_hooks.append(capture_frame)
+
+
+def limit_memory(memory_mb):
+    """Cap this process's address space; a no-op where rlimits don't exist"""
+    if not memory_mb or os.name != "posix":
+        return
+    import resource
+    limit_bytes = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def max_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def summarize(status, elapsed, error=None):
+    frame_times = sorted(recorder.frame_times)
+    total = sum(frame_times)
+    result = {
+        "status": status,
+        "frames": recorder.frames,
+        "elapsed": elapsed,
+        "fps": len(frame_times) / total if total else None,
+        "frame_time_mean": total / len(frame_times) if frame_times else None,
+        "frame_time_p50": percentile(frame_times, 0.50),
+        "frame_time_p95": percentile(frame_times, 0.95),
+        "frame_time_p99": percentile(frame_times, 0.99),
+        "frame_time_max": frame_times[-1] if frame_times else None,
+        "tick_time": recorder.tick_time,
+        "event_time": recorder.event_time,
+        "events": recorder.event_count,
+        "max_rss_kb": max_rss_kb(),
+    }
+    if recorder.pacing_clock is not None and not UNCAPPED:
+        result["pacing"] = recorder.pacing_clock.summary()
+    if error:
+        result["error"] = error
+    return result
+
+
+def prepare(target, args):
+    """Patch pygame and set up the interpreter as if target had been run directly"""
+    if SEED is not None:
+        random.seed(int(SEED))
+        numpy.random.seed(int(SEED))
+
+    install()
+    limit_memory(MEMORY_MB)
+    sys.argv = [target] + list(args)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(target)))
+
+
+def run(target, args):
+    """Run an entry script under the shim and return its result dict"""
+    prepare(target, args)
+    start = time.perf_counter()
+    status, error = "ok", None
+    try:
+        runpy.run_path(target, run_name="__main__")
+    except StopRun:
+        pass
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            status, error = "error", f"SystemExit: {e.code}"
+    except Exception:
+        status, error = "error", traceback.format_exc(limit=5)
+    elapsed = time.perf_counter() - start
+
+    try:
+        pygame.quit()
+    except Exception:
+        pass
+    return summarize(status, elapsed, error)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(2)
+    if PASSTHROUGH:
+        # Errors and exit codes propagate exactly as if the entry ran alone
+        target = sys.argv[1]
+        prepare(target, sys.argv[2:])
+        runpy.run_path(target, run_name="__main__")
+        return
+    result = run(sys.argv[1], sys.argv[2:])
+    if RESULT_PATH:
+        with open(RESULT_PATH, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+    else:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ import math
 import sys
 from pygame import Vector2
 
+from pacing import FrameClock
+
 # Initialize Pygame
 pygame.init()
 
@@ -24,7 +26,7 @@ RED = (255, 0, 0)
 # Set up the display
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Bouncing Ball in Rotating Hexagon")
-clock = pygame.time.Clock()
+clock = FrameClock()
 
 class Ball:
     def __init__(self):
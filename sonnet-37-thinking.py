@@ -4,6 +4,8 @@ import math
 from pygame.locals import *
 import random
 
+from pacing import FrameClock
+
 # Initialize pygame
 pygame.init()
 
@@ -23,7 +25,7 @@ HEX_ROTATION_SPEED = 0.5  # degrees per frame
 # Set up the display
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Ball Bouncing in a Spinning Hexagon")
-clock = pygame.time.Clock()
+clock = FrameClock()
 
 class Ball:
     def __init__(self, x, y, radius):
@@ -1,15 +1,16 @@
+import argparse
 import pygame
 import sys
 import math
 import numpy as np
 
-# Initialize pygame
-pygame.init()
+from analytics import TrajectoryAnalyzer, TrajectoryWriter
+from pacing import FrameClock
+from pipeline import DoubleBuffer, PhysicsThread
 
 # Screen dimensions
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Ball Bouncing in a Spinning Hexagon")
+FPS = 60
 
 # Colors
 WHITE = (255, 255, 255)
@@ -24,133 +25,238 @@ RESTITUTION = 0.8  # Bounciness
 
 # Ball properties
 ball_radius = 15
-ball_pos = np.array([WIDTH // 2, HEIGHT // 3], dtype=float)
-ball_vel = np.array([2.0, 0.0], dtype=float)
+BALL_START_POS = (WIDTH // 2, HEIGHT // 3)
+BALL_START_VEL = (2.0, 0.0)
 
 # Hexagon properties
 hexagon_radius = 200
 hexagon_center = np.array([WIDTH // 2, HEIGHT // 2])
-hexagon_rotation = 0
-hexagon_rotation_speed = 0.01
-
-# Clock for controlling frame rate
-clock = pygame.time.Clock()
-
-def rotate_point(point, center, angle):
-    """Rotate a point around a center by an angle (in radians)"""
-    s, c = math.sin(angle), math.cos(angle)
-    point = point - center
-    rotated_point = np.array([
-        point[0] * c - point[1] * s,
-        point[0] * s + point[1] * c
-    ])
-    return rotated_point + center
-
-def get_hexagon_vertices():
-    """Get the vertices of the hexagon after rotation"""
-    vertices = []
-    for i in range(6):
-        angle = hexagon_rotation + i * (2 * math.pi / 6)
-        x = hexagon_center[0] + hexagon_radius * math.cos(angle)
-        y = hexagon_center[1] + hexagon_radius * math.sin(angle)
-        vertices.append(np.array([x, y]))
-    return vertices
-
-def get_hexagon_edges():
-    """Get the edges (line segments) of the hexagon"""
-    vertices = get_hexagon_vertices()
-    edges = []
-    for i in range(6):
-        edges.append((vertices[i], vertices[(i + 1) % 6]))
-    return edges
-
-def distance_point_to_line(point, line_start, line_end):
-    """Calculate the distance from a point to a line segment"""
-    line_vec = line_end - line_start
-    point_vec = point - line_start
-    line_len = np.linalg.norm(line_vec)
-    line_unitvec = line_vec / line_len
-    point_vec_scaled = point_vec / line_len
-    t = np.clip(np.dot(line_unitvec, point_vec_scaled), 0, 1)
-    nearest = line_start + t * line_vec
-    dist = np.linalg.norm(nearest - point)
-    return dist, nearest
-
-def reflect_velocity(velocity, normal):
-    """Reflect velocity vector across a normal vector"""
-    normal = normal / np.linalg.norm(normal)  # Ensure normal is a unit vector
-    return velocity - 2 * np.dot(velocity, normal) * normal
-
-# Main game loop
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                running = False
-            elif event.key == pygame.K_SPACE:
-                # Reset ball position
-                ball_pos = np.array([WIDTH // 2, HEIGHT // 3], dtype=float)
-                ball_vel = np.array([2.0, 0.0], dtype=float)
-            elif event.key == pygame.K_UP:
-                hexagon_rotation_speed += 0.005
-            elif event.key == pygame.K_DOWN:
-                hexagon_rotation_speed -= 0.005
-
-    # Update hexagon rotation
-    hexagon_rotation += hexagon_rotation_speed
-
-    # Apply gravity to ball velocity
-    ball_vel[1] += GRAVITY
-
-    # Update ball position
-    ball_pos += ball_vel
-
-    # Check for collisions with hexagon edges
-    edges = get_hexagon_edges()
-    for edge_start, edge_end in edges:
-        distance, nearest = distance_point_to_line(ball_pos, edge_start, edge_end)
-        
-        if distance <= ball_radius:
-            # Calculate normal vector (perpendicular to the edge)
-            edge_vec = edge_end - edge_start
-            normal = np.array([-edge_vec[1], edge_vec[0]])
-            normal = normal / np.linalg.norm(normal)
-            
-            # Make sure normal points toward the ball
-            if np.dot(normal, ball_pos - nearest) < 0:
-                normal = -normal
-                
+HEXAGON_ROTATION_SPEED = 0.01
+
+
+class HexagonCollider:
+    """Ball-vs-hexagon collision kernel with the geometry precomputed.
+
+    The hexagon is fixed in its own (rotating) frame, so everything that does
+    not depend on the ball is computed once here: edges holds, per edge, the
+    unit vector along it, the unit normal across it and the projections of
+    its start onto both.  Each step rotates the ball into that frame once
+    and tests the edges with a few multiply-adds on plain floats; nothing
+    is allocated per frame.
+
+    Plain floats beat NumPy here: bench_sonnet37.py times a fully vectorized
+    NumPy version of this kernel, and for a single ball each NumPy call costs
+    more than the six-edge arithmetic it replaces.
+    """
+
+    def __init__(self, center, radius, ball_radius):
+        self.cx, self.cy = float(center[0]), float(center[1])
+        self.side = float(radius)  # A regular hexagon's side equals its radius
+        self.ball_radius = float(ball_radius)
+
+        angles = np.arange(6) * (2 * math.pi / 6)
+        starts = radius * np.column_stack((np.cos(angles), np.sin(angles)))
+        dirs = (np.roll(starts, -1, axis=0) - starts) / self.side
+        normals = np.column_stack((-dirs[:, 1], dirs[:, 0]))
+        self.starts = starts
+
+        # (dx, dy, nx, ny, along_offset, across_offset) per edge: a position p
+        # in the hexagon's frame lies p.d - along_offset along the edge from
+        # its start and p.n - across_offset across it
+        self.edges = [tuple(edge) for edge in np.column_stack((
+            dirs, normals,
+            np.einsum("ij,ij->i", starts, dirs),
+            np.einsum("ij,ij->i", starts, normals),
+        )).tolist()]
+
+    def vertices(self, rotation, out=None):
+        """World-space vertices of the hexagon for the given rotation"""
+        if out is None:
+            out = np.empty((6, 2))
+        c, s = math.cos(rotation), math.sin(rotation)
+        sx, sy = self.starts[:, 0], self.starts[:, 1]
+        np.multiply(sx, c, out=out[:, 0])
+        out[:, 0] -= sy * s
+        out[:, 0] += self.cx
+        np.multiply(sx, s, out=out[:, 1])
+        out[:, 1] += sy * c
+        out[:, 1] += self.cy
+        return out
+
+    def bounce(self, x, y, vx, vy, rotation):
+        """Resolve collisions between the ball and the hexagon edges.
+
+        Edges are resolved in order, each against the position left by the
+        previous one, matching the sequential per-edge loop this replaces.
+        Returns the new x, y, vx, vy.
+        """
+        c, s = math.cos(rotation), math.sin(rotation)
+        rx, ry = x - self.cx, y - self.cy
+        px = rx * c + ry * s      # Ball position in the hexagon's frame
+        py = ry * c - rx * s
+        radius = self.ball_radius
+        r2 = radius * radius
+        side = self.side
+        for dx, dy, nx, ny, along_offset, across_offset in self.edges:
+            along = px * dx + py * dy - along_offset
+            across = px * nx + py * ny - across_offset
+            if along < 0:
+                beyond = along
+            elif along > side:
+                beyond = along - side
+            else:
+                beyond = 0.0
+            distance_sq = beyond * beyond + across * across
+            if distance_sq > r2:
+                continue
+
+            # Normal of the edge pointing toward the ball
+            if across < 0:
+                nx, ny = -nx, -ny
+            overlap = radius - math.sqrt(distance_sq)
+            px += overlap * nx
+            py += overlap * ny
+            nx, ny = nx * c - ny * s, nx * s + ny * c
+
             # Move ball outside the edge
-            overlap = ball_radius - distance
-            ball_pos += overlap * normal
-            
+            x += overlap * nx
+            y += overlap * ny
+
             # Reflect velocity with some energy loss
-            ball_vel = reflect_velocity(ball_vel, normal) * RESTITUTION
-            
+            vn = 2 * (vx * nx + vy * ny)
+            vx = (vx - vn * nx) * RESTITUTION
+            vy = (vy - vn * ny) * RESTITUTION
+
             # Apply friction to the component of velocity parallel to the edge
-            parallel = np.array([normal[1], -normal[0]])
-            parallel_component = np.dot(ball_vel, parallel) * parallel
-            perpendicular_component = ball_vel - parallel_component
-            ball_vel = perpendicular_component + parallel_component * FRICTION
-
-    # Clear the screen
-    screen.fill(BLACK)
-    
-    # Draw the hexagon
-    vertices = get_hexagon_vertices()
-    pygame.draw.polygon(screen, WHITE, vertices, 2)
-    
-    # Draw the ball
-    pygame.draw.circle(screen, RED, ball_pos.astype(int), ball_radius)
-    
-    # Update the display
-    pygame.display.flip()
-    
-    # Cap the frame rate
-    clock.tick(60)
-
-pygame.quit()
-sys.exit() 
\ No newline at end of file
+            vp = (vx * ny - vy * nx) * (1 - FRICTION)
+            vx -= vp * ny
+            vy += vp * nx
+        return x, y, vx, vy
+
+    def step(self, ball_pos, ball_vel, rotation):
+        """Advance the ball by one frame, updating both arrays in place"""
+        x, y = ball_pos.tolist()
+        vx, vy = ball_vel.tolist()
+        vy += GRAVITY
+        x, y, vx, vy = self.bounce(x + vx, y + vy, vx, vy, rotation)
+        ball_pos[0] = x
+        ball_pos[1] = y
+        ball_vel[0] = vx
+        ball_vel[1] = vy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ball bouncing in a spinning hexagon.")
+    parser.add_argument("--threaded", action="store_true",
+                        help="run physics on a worker thread, pipelined with rendering")
+    parser.add_argument("--physics-rate", type=float, default=FPS,
+                        help="physics steps per second with --threaded (0 = as fast as possible)")
+    parser.add_argument("--analytics", action="store_true",
+                        help="collect streaming physics-quality statistics, reported on exit")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the trajectory to an .npy file for analytics.py")
+    args = parser.parse_args()
+    threaded = args.threaded
+    analyzer = None
+    if args.analytics:
+        analyzer = TrajectoryAnalyzer(hexagon_center, hexagon_radius, ball_radius, GRAVITY)
+    recorder = TrajectoryWriter(args.record) if args.record else None
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Ball Bouncing in a Spinning Hexagon")
+
+    # Clock for controlling frame rate
+    clock = FrameClock()
+
+    # Simulation state: ball x, y, vx, vy, hexagon rotation, rotation speed
+    state = np.array([*BALL_START_POS, *BALL_START_VEL, 0.0, HEXAGON_ROTATION_SPEED])
+    ball_pos = state[0:2]
+    ball_vel = state[2:4]
+
+    collider = HexagonCollider(hexagon_center, hexagon_radius, ball_radius)
+    vertices = np.empty((6, 2))
+
+    def step():
+        # Update hexagon rotation
+        state[4] += state[5]
+
+        # Apply gravity, move the ball and bounce it off the hexagon edges
+        collider.step(ball_pos, ball_vel, state[4])
+        if analyzer:
+            analyzer.update(*state[:5])
+        if recorder:
+            recorder.update(*state[:5])
+
+    def reset_ball():
+        ball_pos[:] = BALL_START_POS
+        ball_vel[:] = BALL_START_VEL
+
+    def change_rotation_speed(delta):
+        state[5] += delta
+
+    if threaded:
+        buffer = DoubleBuffer(state)
+        physics = PhysicsThread(step, lambda out: np.copyto(out, state), buffer,
+                                rate=args.physics_rate)
+        run = physics.submit
+        frame = np.empty_like(state)
+        physics.start()
+    else:
+        run = lambda command: command()
+        frame = state
+
+    # Main game loop
+    running = True
+    try:
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    elif event.key == pygame.K_SPACE:
+                        # Reset ball position
+                        run(reset_ball)
+                    elif event.key == pygame.K_UP:
+                        run(lambda: change_rotation_speed(0.005))
+                    elif event.key == pygame.K_DOWN:
+                        run(lambda: change_rotation_speed(-0.005))
+
+            if threaded:
+                # Render whichever step the physics thread published last
+                buffer.read(frame)
+            else:
+                step()
+
+            # Clear the screen
+            screen.fill(BLACK)
+
+            # Draw the hexagon
+            collider.vertices(frame[4], out=vertices)
+            pygame.draw.polygon(screen, WHITE, vertices, 2)
+
+            # Draw the ball
+            pygame.draw.circle(screen, RED, frame[0:2].astype(int), ball_radius)
+
+            # Update the display
+            pygame.display.flip()
+
+            # Cap the frame rate
+            clock.tick(FPS)
+    finally:
+        if threaded:
+            physics.stop()
+            print(f"Physics: {physics.steps} steps at {physics.steps_per_second:.1f} steps/s")
+        if recorder:
+            recorder.close()
+        if analyzer:
+            print(analyzer.report())
+
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import struct
+from multiprocessing import resource_tracker, shared_memory
+
+import pygame
+
+# -----------------------------------------------------------------------------
+# Constants
+# -----------------------------------------------------------------------------
+THUMB_WIDTH, THUMB_HEIGHT = 160, 120      # Thumbnail size in pixels
+HEADER = struct.Struct("<QII")            # Sequence counter, width, height
+PIXELS_SIZE = THUMB_WIDTH * THUMB_HEIGHT * 3
+BLOCK_SIZE = HEADER.size + PIXELS_SIZE
+
+
+class ThumbnailBlock:
+    """
+    Shared-memory block holding one RGB thumbnail, owned by the launcher.
+
+    Writers use a sequence lock: the counter is made odd before the pixels
+    are written and even again afterwards.  A reader that sees the same even
+    counter before and after copying the pixels has a complete frame.
+    """
+
+    def __init__(self):
+        self.shm = shared_memory.SharedMemory(create=True, size=BLOCK_SIZE)
+        HEADER.pack_into(self.shm.buf, 0, 0, THUMB_WIDTH, THUMB_HEIGHT)
+        self.last_sequence = 0
+        self.surface = None
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def read(self):
+        """
+        Return a Surface with the latest complete thumbnail, or the previous
+        one if nothing new has been published or a write is in progress.
+        """
+        buf = self.shm.buf
+        sequence = HEADER.unpack_from(buf, 0)[0]
+        if sequence == self.last_sequence or sequence % 2:
+            return self.surface
+        pixels = bytes(buf[HEADER.size:BLOCK_SIZE])
+        if HEADER.unpack_from(buf, 0)[0] != sequence:
+            return self.surface
+        self.last_sequence = sequence
+        self.surface = pygame.image.frombuffer(pixels, (THUMB_WIDTH, THUMB_HEIGHT), "RGB")
+        return self.surface
+
+    def close(self):
+        self.surface = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ThumbnailWriter:
+    """Child-side publisher of downscaled frames into a ThumbnailBlock"""
+
+    def __init__(self, name):
+        self.shm = shared_memory.SharedMemory(name=name)
+        # The launcher owns the block; stop this process's resource tracker
+        # from unlinking it when the child exits
+        resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.sequence = HEADER.unpack_from(self.shm.buf, 0)[0]
+        self._small = None
+
+    def publish(self, surface):
+        """Downscale a frame and publish it; costs one scale and one copy"""
+        if self._small is None or self._small.get_bitsize() != surface.get_bitsize():
+            self._small = pygame.Surface((THUMB_WIDTH, THUMB_HEIGHT), 0, surface)
+        pygame.transform.scale(surface, (THUMB_WIDTH, THUMB_HEIGHT), self._small)
+        pixels = pygame.image.tostring(self._small, "RGB")
+
+        buf = self.shm.buf
+        self.sequence += 1
+        HEADER.pack_into(buf, 0, self.sequence, THUMB_WIDTH, THUMB_HEIGHT)
+        buf[HEADER.size:BLOCK_SIZE] = pixels
+        self.sequence += 1
+        HEADER.pack_into(buf, 0, self.sequence, THUMB_WIDTH, THUMB_HEIGHT)
+
+    def close(self):
+        self.shm.close()